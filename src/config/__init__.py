@@ -8,7 +8,8 @@ from .settings import (
     LLM_MODEL_NAME,
     LLM_TEMPERATURE,
     EXTRACTION_SYSTEM_PROMPT,
-    EXTRACTION_USER_PROMPT_TEMPLATE
+    EXTRACTION_USER_PROMPT_TEMPLATE,
+    EXTRACTION_BATCH_USER_PROMPT_TEMPLATE
 )
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     'LLM_MODEL_NAME',
     'LLM_TEMPERATURE',
     'EXTRACTION_SYSTEM_PROMPT',
-    'EXTRACTION_USER_PROMPT_TEMPLATE'
+    'EXTRACTION_USER_PROMPT_TEMPLATE',
+    'EXTRACTION_BATCH_USER_PROMPT_TEMPLATE'
 ]
@@ -4,6 +4,23 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Concurrent requests per model family when max_concurrency isn't set,
+# sized to stay within the providers' default rate-limit tiers. Model names
+# are matched by their longest listed prefix.
+DEFAULT_MAX_CONCURRENCY = {
+    ("openai", "gpt-4o-mini"): 100,
+    ("openai", "gpt-4o"): 50,
+    ("openai", "gpt-4.1-mini"): 100,
+    ("openai", "gpt-4.1"): 50,
+    ("openai", "gpt-4-turbo"): 20,
+    ("anthropic", "claude-3-5-haiku"): 40,
+    ("anthropic", "claude-3-5-sonnet"): 20,
+    ("anthropic", "claude-3-7-sonnet"): 20,
+    ("anthropic", "claude-sonnet-4"): 20,
+    ("anthropic", "claude-opus-4"): 10,
+}
+FALLBACK_MAX_CONCURRENCY = 8
+
 
 @dataclass
 class LLMConfig:
@@ -14,6 +31,12 @@ class LLMConfig:
     max_tokens: int = 4096
     api_key: Optional[str] = None
     api_base: Optional[str] = None
+    max_concurrency: Optional[int] = None  # None: DEFAULT_MAX_CONCURRENCY for the model
+    enable_cache: bool = True
+    cache_path: Union[str, Path] = ".llm_cache.sqlite"
+    cache_ttl: Optional[float] = None
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
     
     def __post_init__(self):
         """Validate LLM configuration."""
@@ -23,6 +46,24 @@ class LLMConfig:
             raise ValueError(f"Temperature must be between 0 and 2, got {self.temperature}")
         if self.max_tokens <= 0:
             raise ValueError(f"Max tokens must be positive, got {self.max_tokens}")
+        if self.max_concurrency is not None and self.max_concurrency <= 0:
+            raise ValueError(f"Max concurrency must be positive, got {self.max_concurrency}")
+        if self.cache_ttl is not None and self.cache_ttl <= 0:
+            raise ValueError(f"Cache TTL must be positive, got {self.cache_ttl}")
+        if self.requests_per_minute is not None and self.requests_per_minute <= 0:
+            raise ValueError(f"Requests per minute must be positive, got {self.requests_per_minute}")
+        if self.tokens_per_minute is not None and self.tokens_per_minute <= 0:
+            raise ValueError(f"Tokens per minute must be positive, got {self.tokens_per_minute}")
+    
+    def get_max_concurrency(self) -> int:
+        """Get the number of concurrent requests, defaulting by provider and model."""
+        if self.max_concurrency is not None:
+            return self.max_concurrency
+        matches = [
+            (len(prefix), limit) for (provider, prefix), limit in DEFAULT_MAX_CONCURRENCY.items()
+            if provider == self.provider and self.model_name.startswith(prefix)
+        ]
+        return max(matches)[1] if matches else FALLBACK_MAX_CONCURRENCY
 
 
 @dataclass
@@ -30,6 +71,8 @@ class TextProcessingConfig:
     """Configuration for text processing."""
     chunk_size: int = 2000
     chunk_overlap: int = 100
+    pdf_cache_dir: Optional[Union[str, Path]] = None  # None: extract PDFs on every call
+    pdf_workers: int = 1  # processes extracting the pages of a PDF
     
     def __post_init__(self):
         """Validate text processing configuration."""
@@ -39,6 +82,8 @@ class TextProcessingConfig:
             raise ValueError(f"Chunk overlap cannot be negative, got {self.chunk_overlap}")
         if self.chunk_overlap >= self.chunk_size:
             raise ValueError(f"Chunk overlap ({self.chunk_overlap}) must be smaller than chunk size ({self.chunk_size})")
+        if self.pdf_workers < 1:
+            raise ValueError(f"PDF workers must be at least 1, got {self.pdf_workers}")
 
 
 @dataclass
@@ -46,8 +91,15 @@ class ExtractionConfig:
     """Configuration for extraction settings."""
     extraction_mode: str = "triples"  # "triples" or "jsonld"
     ontology_path: Optional[Union[str, Path]] = None
+    ontology_cache_dir: Optional[Union[str, Path]] = None  # None: parse the OWL file on every run
     enable_validation: bool = True
     enable_normalization: bool = True
+    strict_normalization: bool = False  # RDF round-trip of the merged JSON-LD graph
+    enable_semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_path: Optional[Union[str, Path]] = None
+    batch_size: int = 1  # chunks sent per LLM request (triples mode only)
+    result_cache_size: int = 1024  # in-memory chunk results kept; 0 disables
     
     def __post_init__(self):
         """Validate extraction configuration."""
@@ -55,6 +107,12 @@ class ExtractionConfig:
             raise ValueError(f"Unsupported extraction mode: {self.extraction_mode}")
         if self.extraction_mode == "jsonld" and not self.ontology_path:
             raise ValueError("Ontology path is required for JSON-LD extraction mode")
+        if not 0 < self.semantic_cache_threshold <= 1:
+            raise ValueError(f"Semantic cache threshold must be in (0, 1], got {self.semantic_cache_threshold}")
+        if self.batch_size < 1:
+            raise ValueError(f"Batch size must be at least 1, got {self.batch_size}")
+        if self.result_cache_size < 0:
+            raise ValueError(f"Result cache size cannot be negative, got {self.result_cache_size}")
 
 
 @dataclass
@@ -101,21 +159,36 @@ class Configuration:
             temperature=float(os.getenv("LLM_TEMPERATURE", "0.0")),
             max_tokens=int(os.getenv("LLM_MAX_TOKENS", "4096")),
             api_key=os.getenv("OPENAI_API_KEY") if provider == "openai" else os.getenv("ANTHROPIC_API_KEY"),
-            api_base=os.getenv("OPENAI_API_BASE")
+            api_base=os.getenv("OPENAI_API_BASE"),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY")) if os.getenv("LLM_MAX_CONCURRENCY") else None,
+            enable_cache=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+            cache_path=os.getenv("LLM_CACHE_PATH", ".llm_cache.sqlite"),
+            cache_ttl=float(os.getenv("LLM_CACHE_TTL")) if os.getenv("LLM_CACHE_TTL") else None,
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE")) if os.getenv("LLM_REQUESTS_PER_MINUTE") else None,
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE")) if os.getenv("LLM_TOKENS_PER_MINUTE") else None
         )
         
         # Load text processing configuration
         text_config = TextProcessingConfig(
             chunk_size=int(os.getenv("CHUNK_SIZE", "2000")),
-            chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "100"))
+            chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "100")),
+            pdf_cache_dir=os.getenv("PDF_CACHE_DIR"),
+            pdf_workers=int(os.getenv("PDF_WORKERS", "1"))
         )
         
         # Load extraction configuration
         extraction_config = ExtractionConfig(
             extraction_mode=os.getenv("EXTRACTION_MODE", "triples"),
             ontology_path=os.getenv("ONTOLOGY_PATH"),
+            ontology_cache_dir=os.getenv("ONTOLOGY_CACHE_DIR"),
             enable_validation=os.getenv("ENABLE_VALIDATION", "true").lower() == "true",
-            enable_normalization=os.getenv("ENABLE_NORMALIZATION", "true").lower() == "true"
+            enable_normalization=os.getenv("ENABLE_NORMALIZATION", "true").lower() == "true",
+            strict_normalization=os.getenv("STRICT_NORMALIZATION", "false").lower() == "true",
+            enable_semantic_cache=os.getenv("ENABLE_SEMANTIC_CACHE", "false").lower() == "true",
+            semantic_cache_threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")),
+            semantic_cache_path=os.getenv("SEMANTIC_CACHE_PATH"),
+            batch_size=int(os.getenv("EXTRACTION_BATCH_SIZE", "1")),
+            result_cache_size=int(os.getenv("RESULT_CACHE_SIZE", "1024"))
         )
         
         return cls(
@@ -136,17 +209,32 @@ class Configuration:
                 "temperature": self.llm.temperature,
                 "max_tokens": self.llm.max_tokens,
                 "api_key": "***" if self.llm.api_key else None,
-                "api_base": self.llm.api_base
+                "api_base": self.llm.api_base,
+                "max_concurrency": self.llm.get_max_concurrency(),
+                "enable_cache": self.llm.enable_cache,
+                "cache_path": str(self.llm.cache_path),
+                "cache_ttl": self.llm.cache_ttl,
+                "requests_per_minute": self.llm.requests_per_minute,
+                "tokens_per_minute": self.llm.tokens_per_minute
             },
             "text_processing": {
                 "chunk_size": self.text_processing.chunk_size,
-                "chunk_overlap": self.text_processing.chunk_overlap
+                "chunk_overlap": self.text_processing.chunk_overlap,
+                "pdf_cache_dir": str(self.text_processing.pdf_cache_dir) if self.text_processing.pdf_cache_dir else None,
+                "pdf_workers": self.text_processing.pdf_workers
             },
             "extraction": {
                 "extraction_mode": self.extraction.extraction_mode,
                 "ontology_path": str(self.extraction.ontology_path) if self.extraction.ontology_path else None,
+                "ontology_cache_dir": str(self.extraction.ontology_cache_dir) if self.extraction.ontology_cache_dir else None,
                 "enable_validation": self.extraction.enable_validation,
-                "enable_normalization": self.extraction.enable_normalization
+                "enable_normalization": self.extraction.enable_normalization,
+                "strict_normalization": self.extraction.strict_normalization,
+                "enable_semantic_cache": self.extraction.enable_semantic_cache,
+                "semantic_cache_threshold": self.extraction.semantic_cache_threshold,
+                "semantic_cache_path": str(self.extraction.semantic_cache_path) if self.extraction.semantic_cache_path else None,
+                "batch_size": self.extraction.batch_size,
+                "result_cache_size": self.extraction.result_cache_size
             },
             "output_dir": str(self.output_dir) if self.output_dir else None,
             "enable_logging": self.enable_logging,
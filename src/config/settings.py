@@ -1,6 +1,5 @@
 import os
 import warnings
-import pandas as pd
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,8 +7,6 @@ load_dotenv()
 
 # Configure settings for better display and fewer warnings
 warnings.filterwarnings('ignore', category=DeprecationWarning)
-pd.set_option('display.max_rows', 100)
-pd.set_option('display.max_colwidth', 150)
 
 # Text Processing Configuration
 CHUNK_SIZE = 2000
@@ -70,6 +67,47 @@ Please extract ALL Subject-Predicate-Object (S-P-O) triples from the text below.
 **Your JSON Output (MUST start with '[' and end with ']'):**
 """
 
+# User prompt for several chunks sent in one request; the response shape
+# matches the structured output schema of batched requests
+EXTRACTION_BATCH_USER_PROMPT_TEMPLATE = """
+Please extract ALL Subject-Predicate-Object (S-P-O) triples from the text below.
+
+The text consists of separate chunks, each starting with a '### CHUNK <id>' header. Extract triples from each chunk independently and report them under that chunk's id.
+
+**VERY IMPORTANT RULES:**
+1.  **Output Format:** Respond ONLY with a single, valid JSON object with one key, "chunks". Its value is an array with one element per chunk, each an object with keys "chunk_id" (the integer id from the chunk's header) and "triples". "triples" is an array of objects with keys "subject", "predicate", "object"; use an empty array for a chunk without triples.
+2.  **JSON Only:** Do NOT include any text before or after the JSON object (e.g., no 'Here is the JSON:' or explanations). Do NOT use markdown ```json ... ``` tags.
+3.  **Concise Predicates:** Keep the 'predicate' value concise (1-3 words, ideally 1-2). Use verbs or short verb phrases (e.g., 'discovered', 'was born in', 'won').
+4.  **Lowercase:** ALL values for 'subject', 'predicate', and 'object' MUST be lowercase.
+5.  **Pronoun Resolution:** Replace pronouns (she, he, it, her, etc.) with the specific lowercase entity name they refer to based on the text context of the same chunk (e.g., 'marie curie').
+6.  **Specificity:** Capture specific details (e.g., 'nobel prize in physics' instead of just 'nobel prize' if specified).
+7.  **Completeness:** Extract ALL distinct factual relationships mentioned in every chunk.
+
+**Text to Process:**
+{text_chunk}
+
+**Required JSON Output Format Example:**
+{{
+  "chunks": [
+    {{
+      "chunk_id": 1,
+      "triples": [
+        {{ "subject": "marie curie", "predicate": "discovered", "object": "radium" }},
+        {{ "subject": "marie curie", "predicate": "won", "object": "nobel prize in physics" }}
+      ]
+    }},
+    {{
+      "chunk_id": 2,
+      "triples": [
+        {{ "subject": "pierre curie", "predicate": "married", "object": "marie curie" }}
+      ]
+    }}
+  ]
+}}
+
+**Your JSON Output (MUST start with '{{' and end with '}}'):**
+"""
+
 # JSON-LD Extraction Prompts
 JSONLD_SYSTEM_PROMPT = """
 You are an AI expert specialized in extracting structured information from text and representing it in JSON-LD format according to a provided ontology.
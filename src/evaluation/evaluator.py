@@ -9,8 +9,13 @@ import seaborn as sns
 from difflib import unified_diff
 
 from src.pipeline import KnowledgeGraphPipeline
+from src.utils.logger import Logger
 from src.config.configuration import Configuration, LLMConfig, TextProcessingConfig, ExtractionConfig
 
+# Display options for the comparison DataFrames
+pd.set_option('display.max_rows', 100)
+pd.set_option('display.max_colwidth', 150)
+
 @dataclass
 class EvaluationConfig:
     """Configuration for pipeline evaluation."""
@@ -90,9 +95,8 @@ class PipelineEvaluator:
         Returns:
             Dictionary containing evaluation results
         """
-        print(f"\nInitializing pipeline with provider: {config.llm_provider}")
-        print(f"Model name: {config.model_name}")
-        print(f"Temperature: {config.temperature}")
+        Logger.info(f"Initializing pipeline with provider: {config.llm_provider}, "
+                    f"model: {config.model_name}, temperature: {config.temperature}")
         
         # Convert to new Configuration format
         new_config = config.to_configuration()
@@ -106,7 +110,7 @@ class PipelineEvaluator:
         end_time = datetime.now()
         
         if not success:
-            print(f"Error processing text: {error}")
+            Logger.error(f"Error processing text: {error}")
         
         # Prepare evaluation results
         eval_result = {
@@ -217,9 +221,9 @@ class PipelineEvaluator:
             return "Error: One or both configurations failed to process"
         
         # Extract triples from results
-        print("\nExtracting triples from results...")
-        print(f"Config 1 raw triples: {result1['results']['triples']}")
-        print(f"Config 2 raw triples: {result2['results']['triples']}")
+        if Logger.is_debug_enabled():
+            Logger.debug(f"Config 1 raw triples: {result1['results']['triples']}")
+            Logger.debug(f"Config 2 raw triples: {result2['results']['triples']}")
         
         # Convert triples to comparable format
         def make_comparable(triple):
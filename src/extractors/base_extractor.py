@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple, Union
 from src.config.configuration import Configuration
@@ -31,6 +32,91 @@ class BaseExtractor(ABC):
         """
         pass
     
+    async def extract_from_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, Union[List[Dict], Dict], Optional[str]]:
+        """
+        Asynchronous counterpart of extract_from_chunk.
+        
+        Subclasses override this to await the LLM client's async API so that
+        several chunks can be processed concurrently. The default
+        implementation delegates to the blocking extract_from_chunk.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, extracted_data, error_message)
+        """
+        return self.extract_from_chunk(chunk)
+    
+    async def fetch_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, Union[List[Dict], Dict, str, None], Optional[str]]:
+        """
+        Send a chunk to the LLM without post-processing the response.
+        
+        Together with handle_chunk_response this splits extraction into an
+        I/O-bound and a CPU-bound phase that the pipeline can overlap. The
+        default implementation performs the whole extraction here.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, raw_data, error_message)
+        """
+        return await self.extract_from_chunk_async(chunk)
+    
+    async def fetch_batch_async(self, chunks: List[Dict[str, Union[str, int]]]) -> List[Union[Tuple[bool, Union[List[Dict], Dict, str, None], Optional[str]], BaseException]]:
+        """
+        Send a batch of chunks to the LLM without post-processing the responses.
+        
+        Extractors that can combine several chunks into one request override
+        this. The default implementation fetches each chunk separately.
+        
+        Args:
+            chunks: Chunks to fetch
+            
+        Returns:
+            The fetch_chunk_async result for each chunk, in order, or the
+            exception raised while fetching it
+        """
+        return list(await asyncio.gather(
+            *(self.fetch_chunk_async(chunk) for chunk in chunks),
+            return_exceptions=True
+        ))
+    
+    def handle_chunk_response(self, chunk: Dict[str, Union[str, int]], success: bool, data, error: Optional[str]) -> Tuple[bool, Union[List[Dict], Dict], Optional[str]]:
+        """
+        Validate and post-process the result of fetch_chunk_async.
+        
+        The default implementation returns the result unchanged.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            success: Whether the LLM call succeeded
+            data: Data returned by the LLM client
+            error: Error message if the call failed
+            
+        Returns:
+            tuple: (success, extracted_data, error_message)
+        """
+        return success, data, error
+    
+    def reassign_chunk(self, data: Union[List[Dict], Dict], chunk_number: int) -> Union[List[Dict], Dict]:
+        """
+        Adapt data extracted from one chunk to an identical chunk.
+        
+        Used when duplicate chunks share a single extraction. The default
+        returns the data unchanged; extractors that record chunk numbers
+        return a copy stamped with the new number.
+        
+        Args:
+            data: Data extracted from the original chunk
+            chunk_number: Number of the duplicate chunk
+            
+        Returns:
+            Data attributed to the duplicate chunk
+        """
+        return data
+    
     @abstractmethod
     def process_results(self, all_extracted_data: List[Union[List[Dict], Dict]], failed_chunks: List[Dict]) -> Dict:
         """
@@ -1,13 +1,20 @@
 import json
+import msgspec
 from typing import Dict, List, Optional, Tuple, Union
 from src.extractors.base_extractor import BaseExtractor
 from src.models.base_llm_client import BaseLLMClient
+from src.models.response_parsers import ResponseParserFactory
 from src.config.configuration import Configuration
 from src.processors.ontology_processor import OntologyProcessor
+from src.processors.text_processor import chunk_text
+from src.utils.llm_cache import commit_response
 from src.utils.logger import Logger
-from rdflib import Graph
-from rdflib.plugins.serializers.jsonld import from_rdf
-from rdflib.plugins.parsers.jsonld import to_rdf
+from src.utils.prompt_template import CompiledPrompt
+from pyld import jsonld
+
+
+class ChunkIngestError(Exception):
+    """Raised when a chunk's JSON-LD response can't be used."""
 
 
 class JSONLDExtractor(BaseExtractor):
@@ -22,14 +29,28 @@ class JSONLDExtractor(BaseExtractor):
             config: Configuration settings
         """
         super().__init__(llm_client, config)
+        self.response_parser = ResponseParserFactory.create_parser("jsonld")
         
         # Initialize ontology processor
         if not config.extraction.ontology_path:
             raise ValueError("Ontology path is required for JSON-LD extraction")
         
-        self.ontology_processor = OntologyProcessor(config.extraction.ontology_path)
+        self.ontology_processor = OntologyProcessor(
+            config.extraction.ontology_path,
+            cache_dir=config.extraction.ontology_cache_dir
+        )
+        # Chunks are validated from worker threads, so load everything up front
+        self.ontology_processor.preload()
         self.ontology_info = self.ontology_processor.get_ontology_info()
         self.ontology_context = self.ontology_processor.get_context()
+        # Reused for every chunk's context fix and for the final merge
+        self._context_only = self.ontology_context["@context"]
+        
+        # Both prompts only depend on the ontology apart from the chunk text,
+        # so format them once up front rather than for every chunk.
+        prompt_vars = self._ontology_prompt_vars()
+        self.llm_client.system_prompt = self.llm_client.system_prompt.format(**prompt_vars)
+        self.user_prompt = CompiledPrompt(self.llm_client.user_prompt_template, **prompt_vars)
     
     def extract_from_chunk(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, Dict, Optional[str]]:
         """
@@ -42,58 +63,102 @@ class JSONLDExtractor(BaseExtractor):
             tuple: (success, jsonld_data, error_message)
         """
         try:
-            Logger.info(f"Processing chunk {chunk['chunk_number']} for JSON-LD extraction")
-            
-            # Format user and system prompts with ontology information
-            prompt_vars = {
-                'classes': ", ".join(self.ontology_info.get("classes", [])),
-                'object_properties': ", ".join(self.ontology_info.get("object_properties", [])),
-                'data_properties': ", ".join(self.ontology_info.get("data_properties", [])),
-                'base_iri': self.ontology_info.get("base_iri", ""),
-                'context': json.dumps(self.ontology_context, indent=2),
-                'ontology_owl': self.ontology_processor.get_owl_content(),
-                'text_chunk': chunk['text']
-            }
-            user_prompt = self.llm_client.user_prompt_template.format(**prompt_vars)
-            system_prompt = self.llm_client.system_prompt.format(**prompt_vars)
-            
-            # Debug: Print the exact prompts sent to the LLM
-            print(f"\n{'='*80}")
-            print(f"EXACT PROMPTS SENT TO LLM FOR CHUNK {chunk['chunk_number']}")
-            print(f"{'='*80}")
-            print(f"\nSYSTEM PROMPT:")
-            print(f"{'='*40}")
-            print(system_prompt)
-            print(f"\n{'='*40}")
-            print(f"USER PROMPT:")
-            print(f"{'='*40}")
-            print(user_prompt)
-            print(f"\n{'='*80}")
-            
-            # Set the formatted system prompt on the client (if needed)
-            self.llm_client.system_prompt = system_prompt
+            user_prompt = self._build_user_prompt(chunk)
             
             # Extract JSON-LD using LLM client
             success, data, error = self.llm_client.extract_triples(user_prompt, chunk['chunk_number'])
             
-            if success:
-                # Process the extracted data
-                processed_data = self._process_extracted_data(data, chunk['chunk_number'])
-                if processed_data:
-                    return True, processed_data, None
-                else:
-                    error_msg = f"Failed to process JSON-LD data from chunk {chunk['chunk_number']}"
-                    Logger.warning(error_msg)
-                    return False, {}, error_msg
-            else:
-                Logger.error(f"Failed to extract JSON-LD from chunk {chunk['chunk_number']}: {error}")
-                return False, {}, error
+            return self.handle_chunk_response(chunk, success, data, error)
                 
         except Exception as e:
             error_msg = f"Error processing chunk {chunk['chunk_number']}: {str(e)}"
             Logger.error(error_msg)
             return False, {}, error_msg
     
+    async def extract_from_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, Dict, Optional[str]]:
+        """
+        Extract JSON-LD from a text chunk using the async LLM API.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, jsonld_data, error_message)
+        """
+        success, data, error = await self.fetch_chunk_async(chunk)
+        return self.handle_chunk_response(chunk, success, data, error)
+    
+    async def fetch_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, Dict, Optional[str]]:
+        """
+        Send a chunk to the LLM without validating the response.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, raw_data, error_message)
+        """
+        try:
+            user_prompt = self._build_user_prompt(chunk)
+            return await self.llm_client.extract_triples_async(user_prompt, chunk['chunk_number'])
+        except Exception as e:
+            error_msg = f"Error processing chunk {chunk['chunk_number']}: {str(e)}"
+            Logger.error(error_msg)
+            return False, {}, error_msg
+    
+    def _ontology_prompt_vars(self) -> Dict[str, str]:
+        """Build the ontology-derived prompt variables."""
+        return {
+            'classes': ", ".join(self.ontology_info.get("classes", [])),
+            'object_properties': ", ".join(self.ontology_info.get("object_properties", [])),
+            'data_properties': ", ".join(self.ontology_info.get("data_properties", [])),
+            'base_iri': self.ontology_info.get("base_iri", ""),
+            'context': json.dumps(self.ontology_context, indent=2),
+            'ontology_owl': self.ontology_processor.get_owl_content()
+        }
+    
+    def _build_user_prompt(self, chunk: Dict[str, Union[str, int]]) -> str:
+        """Format the user prompt for a chunk."""
+        Logger.debug(f"Processing chunk {chunk['chunk_number']} for JSON-LD extraction")
+        
+        user_prompt = self.user_prompt.render(chunk_text(chunk))
+        
+        # The system prompt embeds the whole ontology, so only dump the
+        # exact prompts when debugging
+        if Logger.is_debug_enabled():
+            Logger.debug(
+                f"Exact prompts sent to LLM for chunk {chunk['chunk_number']}\n"
+                f"SYSTEM PROMPT:\n{self.llm_client.system_prompt}\n"
+                f"USER PROMPT:\n{user_prompt}"
+            )
+        
+        return user_prompt
+    
+    def handle_chunk_response(self, chunk: Dict[str, Union[str, int]], success: bool, data, error: Optional[str]) -> Tuple[bool, Dict, Optional[str]]:
+        """Parse, validate and normalize the LLM client's result for a chunk."""
+        raw = data
+        if success:
+            success, data, error = self.response_parser.parse(data, chunk['chunk_number'])
+        if not success:
+            Logger.error(f"Failed to extract JSON-LD from chunk {chunk['chunk_number']}: {error}")
+            return False, {}, error
+        
+        try:
+            processed_data = self._ingest_chunk_result(data, chunk['chunk_number'])
+        except ChunkIngestError as e:
+            error_msg = f"Failed to process JSON-LD data from chunk {chunk['chunk_number']}: {str(e)}"
+            Logger.warning(error_msg)
+            return False, {}, error_msg
+        except Exception as e:
+            error_msg = f"Error processing JSON-LD in chunk {chunk['chunk_number']}: {str(e)}"
+            Logger.error(error_msg)
+            return False, {}, error_msg
+        
+        # Only responses that parsed are kept in the LLM cache
+        commit_response(self.llm_client, raw)
+        Logger.debug(f"Successfully extracted and validated JSON-LD from chunk {chunk['chunk_number']}")
+        return True, processed_data, None
+    
     def _fix_llm_context(self, jsonld_data: Dict) -> Dict:
         """
         Fix the LLM's context by replacing it with the correct ontology context.
@@ -105,72 +170,56 @@ class JSONLDExtractor(BaseExtractor):
         Returns:
             JSON-LD data with corrected context
         """
-        # Get our correct context
-        correct_context = self.ontology_processor.get_context()
-        
         # Replace the context
         fixed_data = jsonld_data.copy()
-        fixed_data["@context"] = correct_context["@context"]
+        fixed_data["@context"] = self._context_only
         
-        print(f"Fixed LLM context - replaced with correct ontology context")
         return fixed_data
     
-    def _process_extracted_data(self, data: Union[Dict, str], chunk_number: int) -> Optional[Dict]:
+    def _ingest_chunk_result(self, data: Union[Dict, str], chunk_number: int) -> Dict:
         """
-        Process extracted JSON-LD data.
+        Turn a chunk's parsed response into normalized JSON-LD.
         
         Args:
-            data: Raw extracted data
+            data: Parsed response, or the raw text if it wasn't decoded yet
             chunk_number: Chunk number for tracking
             
         Returns:
-            Processed JSON-LD data or None if processing failed
+            Normalized JSON-LD data
+            
+        Raises:
+            ChunkIngestError: If the data can't be used
         """
-        try:
-            # Debug: Print the raw data
-            print(f"\nRaw LLM response for chunk {chunk_number}:")
-            print(f"Type: {type(data)}")
+        if Logger.is_debug_enabled():
             if isinstance(data, dict):
-                print(f"Keys: {list(data.keys())}")
-                if "@context" in data:
-                    print(f"Context: {data['@context']}")
-            elif isinstance(data, str):
-                print(f"String length: {len(data)}")
-                print(f"First 200 chars: {data[:200]}")
-            
-            # Handle different data formats
-            if isinstance(data, dict) and "@graph" in data:
-                # Fix the context first
-                fixed_data = self._fix_llm_context(data)
-                
-                # Direct JSON-LD response
-                if self._validate_jsonld(fixed_data):
-                    normalized = self._normalize_jsonld(fixed_data)
-                    if normalized:
-                        Logger.info(f"Successfully extracted and validated JSON-LD from chunk {chunk_number}")
-                        return normalized
+                Logger.debug(f"Raw LLM response for chunk {chunk_number}: keys {list(data.keys())}")
             elif isinstance(data, str):
-                # Try to parse as JSON-LD if it's a string
-                try:
-                    json_data = json.loads(data)
-                    if "@graph" in json_data:
-                        # Fix the context first
-                        fixed_data = self._fix_llm_context(json_data)
-                        
-                        if self._validate_jsonld(fixed_data):
-                            normalized = self._normalize_jsonld(fixed_data)
-                            if normalized:
-                                Logger.info(f"Successfully extracted and validated JSON-LD from chunk {chunk_number}")
-                                return normalized
-                except json.JSONDecodeError:
-                    Logger.warning(f"Invalid JSON in chunk {chunk_number}")
-            
-            Logger.warning(f"Unexpected data format in chunk {chunk_number}")
-            return None
-            
-        except Exception as e:
-            Logger.error(f"Error processing JSON-LD in chunk {chunk_number}: {str(e)}")
-            return None
+                Logger.debug(f"Raw LLM response for chunk {chunk_number}: {len(data)} chars, starting {data[:200]!r}")
+        
+        if isinstance(data, str):
+            try:
+                data = msgspec.json.decode(data)
+            except msgspec.DecodeError:
+                raise ChunkIngestError("invalid JSON")
+        if not isinstance(data, dict) or "@graph" not in data:
+            raise ChunkIngestError("unexpected data format")
+        
+        # Fix the context first
+        fixed_data = self._fix_llm_context(data)
+        extraction_config = self.config.extraction
+        if extraction_config.enable_validation and extraction_config.enable_normalization:
+            # Both steps expand the document; share the expansion
+            is_valid, normalized = self.ontology_processor.validate_and_normalize_jsonld(fixed_data)
+            if not is_valid:
+                raise ChunkIngestError("JSON-LD failed ontology validation")
+        else:
+            if not self._validate_jsonld(fixed_data):
+                raise ChunkIngestError("JSON-LD failed ontology validation")
+            normalized = self._normalize_jsonld(fixed_data)
+        
+        if not normalized:
+            raise ChunkIngestError("JSON-LD normalization failed")
+        return normalized
     
     def _validate_jsonld(self, jsonld_data: Dict) -> bool:
         """
@@ -213,18 +262,48 @@ class JSONLDExtractor(BaseExtractor):
         Returns:
             Normalized JSON-LD data
         """
-        # Create a new RDF graph
-        g = Graph()
+        # Convert to an RDF dataset; without a format, pyld keeps it in memory
+        # rather than serializing to N-Quads and parsing it back
+        dataset = jsonld.to_rdf(jsonld_data)
         
-        # Add the JSON-LD data to the graph
-        g.parse(data=json.dumps(jsonld_data), format='json-ld')
-        
-        # Convert back to JSON-LD using the ontology's context
-        context = self.ontology_processor.get_context()["@context"]
-        normalized = from_rdf(g, context)
+        # Convert back to JSON-LD using the ontology's context, keeping the
+        # top-level @graph even when a single node remains
+        expanded = jsonld.from_rdf(dataset)
+        normalized = self.ontology_processor.compact_jsonld(expanded, {"graph": True})
         
         return normalized
     
+    def _merge_nodes(self, nodes: List[Dict]) -> List[Dict]:
+        """
+        Merge nodes that share an @id, in a single pass over the graph.
+        
+        Much cheaper than the RDF round-trip on large graphs. It relies on
+        every chunk having been compacted against the same ontology context,
+        so equal identifiers are spelled the same way. Nodes without an @id
+        are kept as they are.
+        
+        Args:
+            nodes: Nodes from all chunks' @graph lists
+            
+        Returns:
+            The merged nodes, in order of first appearance
+        """
+        node_index: Dict[str, Dict] = {}
+        merged = []
+        for node in nodes:
+            node_id = node.get("@id") if isinstance(node, dict) else None
+            if not isinstance(node_id, str):
+                merged.append(node)
+                continue
+            existing = node_index.get(node_id)
+            if existing is None:
+                # Copy so merging never modifies a chunk's (possibly cached) result
+                existing = node_index[node_id] = dict(node)
+                merged.append(existing)
+            else:
+                _merge_props(existing, node)
+        return merged
+    
     def process_results(self, all_extracted_data: List[Dict], failed_chunks: List[Dict]) -> Dict:
         """
         Process and combine all extracted JSON-LD data.
@@ -238,17 +317,21 @@ class JSONLDExtractor(BaseExtractor):
         """
         try:
             # Merge all JSON-LD graphs into a single graph
-            merged_data = {
-                "@context": self.ontology_processor.get_context()["@context"],
-                "@graph": []
-            }
-            
-            for data in all_extracted_data:
-                if "@graph" in data:
-                    merged_data["@graph"].extend(data["@graph"])
+            merged_data = self.ontology_processor.combine_jsonld(all_extracted_data)
             
-            # Normalize through RDF graph to ensure proper deduplication
-            normalized_data = self._normalize_jsonld_through_rdf(merged_data)
+            if self.config.extraction.strict_normalization:
+                if len(all_extracted_data) > 1 and _has_repeated_ids(merged_data["@graph"]):
+                    # Normalize through RDF graph to ensure proper deduplication
+                    normalized_data = self._normalize_jsonld_through_rdf(merged_data)
+                else:
+                    # Chunks were already normalized one by one and no node
+                    # occurs twice, so the round-trip would change nothing
+                    normalized_data = merged_data
+            else:
+                normalized_data = {
+                    "@context": self._context_only,
+                    "@graph": self._merge_nodes(merged_data["@graph"])
+                }
             
             # Get statistics about the normalization
             original_count = len(merged_data["@graph"])
@@ -274,7 +357,7 @@ class JSONLDExtractor(BaseExtractor):
         except Exception as e:
             Logger.error(f"Error processing JSON-LD results: {str(e)}")
             return {
-                'jsonld': {"@context": self.ontology_processor.get_context()["@context"], "@graph": []},
+                'jsonld': {"@context": self._context_only, "@graph": []},
                 'statistics': {
                     'total_chunks': len(all_extracted_data) + len(failed_chunks),
                     'processed_chunks': 0,
@@ -306,4 +389,52 @@ class JSONLDExtractor(BaseExtractor):
         if not isinstance(data["@graph"], list):
             return False
         
-        return True 
\ No newline at end of file
+        return True 
+
+
+def _has_repeated_ids(nodes: List[Dict]) -> bool:
+    """Whether any @id occurs on more than one node."""
+    seen = set()
+    for node in nodes:
+        node_id = node.get("@id") if isinstance(node, dict) else None
+        if isinstance(node_id, str):
+            if node_id in seen:
+                return True
+            seen.add(node_id)
+    return False
+
+
+def _freeze(value) -> bytes:
+    """Hashable form of a JSON-LD value, for comparing values."""
+    return msgspec.json.encode(value, order="sorted")
+
+
+def _merge_props(target: Dict, node: Dict) -> None:
+    """
+    Merge a node's properties into another node with the same @id.
+    
+    Values of properties present in both are combined into a list without
+    duplicates. New lists are created rather than extended in place.
+    
+    Args:
+        target: Node to merge into
+        node: Node whose properties are added
+    """
+    for key, value in node.items():
+        if key == "@id":
+            continue
+        if key not in target:
+            target[key] = value
+            continue
+        current = target[key]
+        current_values = current if isinstance(current, list) else [current]
+        new_values = value if isinstance(value, list) else [value]
+        seen = {_freeze(v) for v in current_values}
+        added = []
+        for v in new_values:
+            frozen = _freeze(v)
+            if frozen not in seen:
+                seen.add(frozen)
+                added.append(v)
+        if added:
+            target[key] = current_values + added
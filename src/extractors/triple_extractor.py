@@ -1,9 +1,13 @@
 from typing import Dict, List, Optional, Tuple, Union
 from src.extractors.base_extractor import BaseExtractor
 from src.models.base_llm_client import BaseLLMClient
+from src.models.response_parsers import ResponseParserFactory
 from src.config.configuration import Configuration
-from src.processors.text_processor import TextProcessor
+from src.config.settings import EXTRACTION_BATCH_USER_PROMPT_TEMPLATE
+from src.processors.text_processor import TextProcessor, chunk_text
+from src.utils.llm_cache import commit_response
 from src.utils.logger import Logger
+from src.utils.prompt_template import CompiledPrompt
 
 
 class TripleExtractor(BaseExtractor):
@@ -18,6 +22,9 @@ class TripleExtractor(BaseExtractor):
             config: Configuration settings
         """
         super().__init__(llm_client, config)
+        self.response_parser = ResponseParserFactory.create_parser("triples")
+        self.user_prompt = CompiledPrompt(llm_client.user_prompt_template)
+        self.batch_prompt = CompiledPrompt(EXTRACTION_BATCH_USER_PROMPT_TEMPLATE)
         self.text_processor = TextProcessor(
             chunk_size=config.text_processing.chunk_size,
             overlap=config.text_processing.chunk_overlap
@@ -34,31 +41,138 @@ class TripleExtractor(BaseExtractor):
             tuple: (success, triples, error_message)
         """
         try:
-            Logger.info(f"Processing chunk {chunk['chunk_number']} for triple extraction")
-            
-            # Format user prompt
-            user_prompt = self.llm_client.user_prompt_template.format(text_chunk=chunk['text'])
+            user_prompt = self._build_user_prompt(chunk)
             
             # Extract triples using LLM client
             success, data, error = self.llm_client.extract_triples(user_prompt, chunk['chunk_number'])
             
-            if success:
-                if self.validate_data(data):
-                    Logger.info(f"Successfully extracted {len(data)} triples from chunk {chunk['chunk_number']}")
-                    return True, data, None
-                else:
-                    error_msg = f"Invalid triple data from chunk {chunk['chunk_number']}"
-                    Logger.warning(error_msg)
-                    return False, [], error_msg
-            else:
-                Logger.error(f"Failed to extract triples from chunk {chunk['chunk_number']}: {error}")
-                return False, [], error
+            return self.handle_chunk_response(chunk, success, data, error)
                 
         except Exception as e:
             error_msg = f"Error processing chunk {chunk['chunk_number']}: {str(e)}"
             Logger.error(error_msg)
             return False, [], error_msg
     
+    async def extract_from_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, List[Dict], Optional[str]]:
+        """
+        Extract triples from a text chunk using the async LLM API.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, triples, error_message)
+        """
+        success, data, error = await self.fetch_chunk_async(chunk)
+        return self.handle_chunk_response(chunk, success, data, error)
+    
+    async def fetch_chunk_async(self, chunk: Dict[str, Union[str, int]]) -> Tuple[bool, List[Dict], Optional[str]]:
+        """
+        Send a chunk to the LLM without validating the response.
+        
+        Args:
+            chunk: Dictionary containing chunk text and number
+            
+        Returns:
+            tuple: (success, raw_data, error_message)
+        """
+        try:
+            user_prompt = self._build_user_prompt(chunk)
+            return await self.llm_client.extract_triples_async(user_prompt, chunk['chunk_number'])
+        except Exception as e:
+            error_msg = f"Error processing chunk {chunk['chunk_number']}: {str(e)}"
+            Logger.error(error_msg)
+            return False, [], error_msg
+    
+    async def fetch_batch_async(self, chunks: List[Dict[str, Union[str, int]]]) -> List[Tuple[bool, List[Dict], Optional[str]]]:
+        """
+        Send several chunks to the LLM in a single request.
+        
+        Falls back to one request per chunk when the client can't batch or
+        the batch request fails, and retries chunks missing from or
+        malformed in the batch response with a request of their own.
+        
+        Args:
+            chunks: Chunks to fetch
+            
+        Returns:
+            The (success, raw_data, error_message) result for each chunk, in order
+        """
+        if len(chunks) == 1 or not self.llm_client.supports_batch:
+            return await super().fetch_batch_async(chunks)
+        
+        chunk_numbers = [chunk['chunk_number'] for chunk in chunks]
+        try:
+            user_prompt = self._build_batch_prompt(chunks)
+            success, llm_output, error = await self.llm_client.extract_triples_batch_async(user_prompt, chunk_numbers)
+            if success:
+                # Split the batch into per-chunk triple lists, which
+                # handle_chunk_response accepts as already parsed
+                results = self.response_parser.parse_batch(llm_output, chunk_numbers)
+                outcomes = [results[n] for n in chunk_numbers]
+                if all(outcome[0] and self.validate_data(outcome[1]) for outcome in outcomes):
+                    commit_response(self.llm_client, llm_output)
+        except Exception as e:
+            success, error = False, str(e)
+            Logger.error(f"Error processing chunks {chunk_numbers}: {error}")
+        
+        if not success:
+            Logger.info(f"Batch request for chunks {chunk_numbers} failed ({error}), retrying them individually")
+            return await super().fetch_batch_async(chunks)
+        
+        unparsed = [i for i, outcome in enumerate(outcomes) if not outcome[0]]
+        if unparsed:
+            Logger.info(f"Retrying {len(unparsed)} chunks of batch {chunk_numbers} individually")
+            retried = await super().fetch_batch_async([chunks[i] for i in unparsed])
+            for i, outcome in zip(unparsed, retried):
+                outcomes[i] = outcome
+        return outcomes
+    
+    def _build_batch_prompt(self, chunks: List[Dict[str, Union[str, int]]]) -> str:
+        """Format one user prompt covering several chunks."""
+        Logger.debug(f"Processing chunks {[chunk['chunk_number'] for chunk in chunks]} for triple extraction")
+        sections = "\n\n".join(
+            f"### CHUNK {chunk['chunk_number']}\n```text\n{chunk_text(chunk)}\n```" for chunk in chunks
+        )
+        return self.batch_prompt.render(sections)
+    
+    def _build_user_prompt(self, chunk: Dict[str, Union[str, int]]) -> str:
+        """Format the user prompt for a chunk."""
+        Logger.debug(f"Processing chunk {chunk['chunk_number']} for triple extraction")
+        return self.user_prompt.render(chunk_text(chunk))
+    
+    def handle_chunk_response(self, chunk: Dict[str, Union[str, int]], success: bool, data, error: Optional[str]) -> Tuple[bool, List[Dict], Optional[str]]:
+        """Parse and validate the LLM client's result for a chunk."""
+        raw = data
+        if success and isinstance(data, str):
+            success, data, error = self.response_parser.parse(data, chunk['chunk_number'])
+        if success:
+            if self.validate_data(data):
+                # Only responses that parsed are kept in the LLM cache
+                commit_response(self.llm_client, raw)
+                Logger.debug(f"Successfully extracted {len(data)} triples from chunk {chunk['chunk_number']}")
+                return True, data, None
+            else:
+                error_msg = f"Invalid triple data from chunk {chunk['chunk_number']}"
+                Logger.warning(error_msg)
+                return False, [], error_msg
+        else:
+            Logger.error(f"Failed to extract triples from chunk {chunk['chunk_number']}: {error}")
+            return False, [], error
+    
+    def reassign_chunk(self, data: List[Dict], chunk_number: int) -> List[Dict]:
+        """
+        Copy triples extracted from one chunk for an identical chunk.
+        
+        Args:
+            data: Triples from the original chunk
+            chunk_number: Number of the duplicate chunk
+            
+        Returns:
+            Copies of the triples with their chunk number updated
+        """
+        return [dict(triple, chunk=chunk_number) for triple in data]
+    
     def process_results(self, all_extracted_data: List[List[Dict]], failed_chunks: List[Dict]) -> Dict:
         """
         Process and combine all extracted triples.
@@ -1,32 +1,33 @@
 import anthropic
-import time
-import json
+import asyncio
+import functools
+import httpx
 import os
-from src.models.base_llm_client import BaseLLMClient
+from src.models.base_llm_client import BaseLLMClient, MOCK_TRIPLES_RESPONSE, MOCK_JSONLD_RESPONSE
 from src.config.settings import (
     ANTHROPIC_API_KEY
 )
-import requests
-from requests.exceptions import Timeout, RequestException
-import signal
-from contextlib import contextmanager
-import sys
-from typing import List, Dict
+from typing import List, Dict, Optional
+from src.utils.llm_cache import LLMCache, cached_call
+from src.utils.logger import Logger
+from src.models.retry import api_retry
+from src.models.rate_limiter import RateLimiter, rate_limited
+
+# Failures worth retrying: rate limits, dropped connections and 5xx errors
+RETRYABLE_ERRORS = (anthropic.RateLimitError, anthropic.APIConnectionError, anthropic.InternalServerError)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_anthropic_client(api_key):
+    """Return the process-wide SDK client for an API key, shared by all AnthropicClients."""
+    return anthropic.Anthropic(
+        api_key=api_key,
+        max_retries=0  # retries are handled by api_retry
+    )
 
 class TimeoutException(Exception):
     pass
 
-@contextmanager
-def time_limit(seconds):
-    def signal_handler(signum, frame):
-        raise TimeoutException("Timed out!")
-    signal.signal(signal.SIGALRM, signal_handler)
-    signal.alarm(seconds)
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-
 class AnthropicClient(BaseLLMClient):
     def __init__(
         self, 
@@ -34,7 +35,10 @@ class AnthropicClient(BaseLLMClient):
         temperature: float = None, 
         max_tokens: int = None,
         system_prompt: str = None,
-        user_prompt_template: str = None
+        user_prompt_template: str = None,
+        llm_cache: Optional[LLMCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the Anthropic client.
@@ -45,6 +49,9 @@ class AnthropicClient(BaseLLMClient):
             max_tokens: Maximum tokens to use
             system_prompt: System prompt to use
             user_prompt_template: User prompt template to use
+            llm_cache: Optional persistent cache of raw responses
+            rate_limiter: Optional request/token budget shared by all requests
+            http_client: Optional shared connection pool for async requests
         """
         # Use provided values or fall back to environment variables
         self.api_key = os.getenv("ANTHROPIC_API_KEY") or ANTHROPIC_API_KEY
@@ -55,8 +62,13 @@ class AnthropicClient(BaseLLMClient):
         self.is_test_mode = self.api_key == "test-key"
         
         if not self.is_test_mode:
-            self.client = anthropic.Anthropic(
-                api_key=self.api_key
+            self.client = _get_anthropic_client(self.api_key)
+            # Async connections are bound to the event loop that opened them,
+            # so the async client uses the caller's pool or the SDK's own.
+            self.async_client = anthropic.AsyncAnthropic(
+                api_key=self.api_key,
+                http_client=http_client,
+                max_retries=0
             )
             
         # Use provided values (no fallbacks to settings)
@@ -66,12 +78,30 @@ class AnthropicClient(BaseLLMClient):
         self.system_prompt = system_prompt
         self.user_prompt_template = user_prompt_template
         self.timeout = 30  # 30 seconds timeout
+        self.llm_cache = llm_cache
+        self.rate_limiter = rate_limiter
         
-        print(f"\nAnthropic client initialized with:")
-        print(f"Model: {self.model_name}")
-        print(f"Temperature: {self.temperature}")
-        print(f"System prompt length: {len(self.system_prompt)}")
-        print(f"User prompt template length: {len(self.user_prompt_template)}")
+        if Logger.is_debug_enabled():
+            Logger.debug(
+                f"Anthropic client initialized with model {self.model_name}, "
+                f"temperature {self.temperature}, "
+                f"system prompt length {len(self.system_prompt)}, "
+                f"user prompt template length {len(self.user_prompt_template)}"
+            )
+
+    @property
+    def system_prompt(self):
+        """The system prompt sent with every request."""
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, value):
+        self._system_prompt = value
+        # Marked cacheable so the prompt prefix is served from Anthropic's
+        # prompt cache for every chunk after the first.
+        self._static_system_block = [
+            {"type": "text", "text": value, "cache_control": {"type": "ephemeral"}}
+        ]
 
     def extract_triples(self, user_prompt, chunk_number):
         """
@@ -82,157 +112,179 @@ class AnthropicClient(BaseLLMClient):
             chunk_number (int): The chunk number for tracking
         
         Returns:
-            tuple: (success, result, error_message)
-            - success (bool): Whether the extraction was successful
-            - result: For triple extraction: List of dicts with subject/predicate/object
-                     For JSON-LD: Dict containing JSON-LD data or string containing JSON-LD
+            tuple: (success, llm_output, error_message)
+            - success (bool): Whether a non-empty response was received
+            - llm_output (str): Raw response text, parsed by the extractor
             - error_message (str): Error message if unsuccessful
         """
         if self.is_test_mode:
             # Return mock data for testing
             if "JSON-LD" in self.system_prompt:
-                # Return mock JSON-LD data
-                return True, {
-                    "@graph": [{
-                        "@id": "person:marie_curie",
-                        "@type": "Person",
-                        "name": "Marie Curie",
-                        "discovered": [{
-                            "@id": "element:radium",
-                            "@type": "Discovery",
-                            "name": "Radium"
-                        }]
-                    }]
-                }, None
-            else:
-                # Return mock triple data
-                return True, [
-                    {
-                        "subject": "marie curie",
-                        "predicate": "discovered",
-                        "object": "radium",
-                        "chunk": chunk_number
-                    },
-                    {
-                        "subject": "marie curie",
-                        "predicate": "won",
-                        "object": "nobel prize in physics",
-                        "chunk": chunk_number
-                    }
-                ], None
+                return True, MOCK_JSONLD_RESPONSE, None
+            return True, MOCK_TRIPLES_RESPONSE, None
         
         try:
-            print(f"Making API call to Anthropic for chunk {chunk_number}...")
-            print(f"Using model: {self.model_name}")
-            print(f"System prompt length: {len(self.system_prompt)}")
-            print(f"User prompt length: {len(user_prompt)}")
+            self._log_request(user_prompt, chunk_number)
             
             try:
-                with time_limit(self.timeout):
-                    # Make the API call with correct message format for Anthropic
-                    response = self.client.messages.create(
-                        model=self.model_name,
-                        max_tokens=self.max_tokens,
-                        system=[
-                            {"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}
-                        ],
-                        messages=[
-                            {"role": "user", "content": user_prompt}
-                        ],
-                        temperature=self.temperature
-                    )
+                llm_output = self._complete(user_prompt)
             except TimeoutException:
-                print(f"Request timed out after {self.timeout} seconds")
+                Logger.warning(f"Request for chunk {chunk_number} timed out after {self.timeout} seconds")
                 return False, None, f"Request timed out after {self.timeout} seconds for chunk {chunk_number}"
             
-            print(f"Received response from Anthropic for chunk {chunk_number}")
+            return self._raw_result(llm_output, chunk_number)
+                
+        except Exception as e:
+            return False, None, self._error_message(e, chunk_number)
+
+    async def extract_triples_async(self, user_prompt, chunk_number):
+        """
+        Extract information from a text chunk using the async Anthropic API.
+        
+        Lets the pipeline keep several chunk requests in flight at once
+        instead of waiting for each round-trip in turn.
+        
+        Args:
+            user_prompt (str): The fully formatted user prompt
+            chunk_number (int): The chunk number for tracking
+        
+        Returns:
+            tuple: (success, llm_output, error_message), as for extract_triples
+        """
+        if self.is_test_mode:
+            return self.extract_triples(user_prompt, chunk_number)
+        
+        try:
+            self._log_request(user_prompt, chunk_number)
             
-            # Calculate and print cost
             try:
-                usage = getattr(response, 'usage', None)
-                if usage:
-                    input_tokens = getattr(usage, 'input_tokens', 0)
-                    output_tokens = getattr(usage, 'output_tokens', 0)
-                else:
-                    # fallback for dict-like response
-                    input_tokens = response.get('usage', {}).get('input_tokens', 0)
-                    output_tokens = response.get('usage', {}).get('output_tokens', 0)
-
-                # Pricing per 1k tokens (as of June 2024)
-                model_prices = {
-                    # Claude 3
-                    'claude-3-opus-20240229': (0.015, 0.075),
-                    'claude-3-sonnet-20240229': (0.003, 0.015),
-                    'claude-3-haiku-20240307': (0.00025, 0.00125),
-                    # Claude 3.5
-                    'claude-3-5-sonnet-20240620': (0.003, 0.015),
-                    'claude-3-5-sonnet-20241022': (0.003, 0.015),
-                    'claude-3-5-haiku-20241022': (0.0008, 0.004),
-                    # Claude 3.7
-                    'claude-3-7-sonnet-20250219': (0.003, 0.015),
-                    # Claude 4
-                    'claude-opus-4-20250514': (0.015, 0.075),
-                    'claude-sonnet-4-20250514': (0.003, 0.015),
-                }
-                # Default to Sonnet pricing if model not found
-                input_price, output_price = model_prices.get(self.model_name, (0.003, 0.015))
-                cost = (input_tokens / 1000) * input_price + (output_tokens / 1000) * output_price
-                print(f"Token usage: input={input_tokens}, output={output_tokens}")
-                print(f"Estimated cost for this call: ${cost:.6f} (model: {self.model_name})")
-            except Exception as e:
-                print(f"[Cost Calculation Error] {e}")
+                llm_output = await self._complete_async(user_prompt)
+            except TimeoutException:
+                Logger.warning(f"Request for chunk {chunk_number} timed out after {self.timeout} seconds")
+                return False, None, f"Request timed out after {self.timeout} seconds for chunk {chunk_number}"
             
-            # Extract and parse the response
-            llm_output = response.content[0].text.strip()
-            if not llm_output:
-                return False, None, "Empty response from LLM"
-                
-            # Parse the JSON response
-            try:
-                parsed_data = json.loads(llm_output)
-                
-                # Check if we're in JSON-LD mode
-                if "JSON-LD" in self.system_prompt:
-                    # Return the JSON-LD data directly
-                    return True, parsed_data, None
-                else:
-                    # Handle triple extraction format
-                    if isinstance(parsed_data, dict):
-                        # Check if this is a single triple object
-                        if all(k in parsed_data for k in ['subject', 'predicate', 'object']):
-                            parsed_json = [parsed_data]  # Wrap single triple in array
-                        else:
-                            list_values = [v for v in parsed_data.values() if isinstance(v, list)]
-                            if len(list_values) == 1:
-                                parsed_json = list_values[0]
-                            else:
-                                return False, None, "JSON object received, but doesn't contain a single list of triples"
-                    elif isinstance(parsed_data, list):
-                        parsed_json = parsed_data
-                    else:
-                        return False, None, "Parsed JSON is not a list or expected dictionary wrapper"
-                    
-                    # Validate and extract triples
-                    valid_triples = []
-                    for item in parsed_json:
-                        if isinstance(item, dict) and all(k in item for k in ['subject', 'predicate', 'object']):
-                            if all(isinstance(item[k], str) for k in ['subject', 'predicate', 'object']):
-                                item['chunk'] = chunk_number
-                                valid_triples.append(item)
-                    
-                    return True, valid_triples, None
+            return self._raw_result(llm_output, chunk_number)
                 
-            except json.JSONDecodeError as json_err:
-                return False, None, f"JSON parsing error: {str(json_err)}"
-                
-        except Timeout:
-            return False, None, f"Request timed out after {self.timeout} seconds for chunk {chunk_number}"
-        except RequestException as e:
-            return False, None, f"Network error: {str(e)}"
-        except anthropic.APIError as e:
-            return False, None, f"Anthropic API Error: {str(e)}"
-        except anthropic.RateLimitError as e:
-            time.sleep(60)  # Wait before retrying
-            return False, None, f"Rate limit exceeded: {str(e)}"
         except Exception as e:
-            return False, None, f"Unexpected error: {str(e)}" 
\ No newline at end of file
+            return False, None, self._error_message(e, chunk_number)
+
+    def _log_request(self, user_prompt, chunk_number):
+        """Log details about an outgoing request at debug level."""
+        if Logger.is_debug_enabled():
+            Logger.debug(
+                f"Making API call to Anthropic for chunk {chunk_number} "
+                f"(model {self.model_name}, system prompt length {len(self.system_prompt)}, "
+                f"user prompt length {len(user_prompt)})"
+            )
+
+    def _raw_result(self, llm_output, chunk_number):
+        """Wrap the raw response text in the client's result tuple."""
+        if Logger.is_debug_enabled():
+            Logger.debug(f"Received response from Anthropic for chunk {chunk_number}")
+        
+        if not llm_output:
+            return False, None, "Empty response from LLM"
+        return True, llm_output, None
+
+    def _error_message(self, error, chunk_number):
+        """Return the error message for a failed request."""
+        if isinstance(error, anthropic.RateLimitError):
+            return f"Rate limit exceeded: {str(error)}"
+        if isinstance(error, anthropic.APIError):
+            return f"Anthropic API Error: {str(error)}"
+        return f"Unexpected error: {str(error)}"
+
+    @cached_call
+    @api_retry(RETRYABLE_ERRORS)
+    @rate_limited
+    def _complete(self, user_prompt):
+        """
+        Send a prompt to the API and return the raw response text.
+        
+        Args:
+            user_prompt (str): The fully formatted user prompt
+        
+        Transient failures (rate limits, connection errors, 5xx) are retried
+        with exponential backoff, honoring Retry-After.
+        
+        Returns:
+            str: The stripped response content
+        
+        Raises:
+            TimeoutException: If the request exceeds self.timeout seconds
+        """
+        try:
+            # Make the API call with correct message format for Anthropic
+            response = self.client.messages.create(**self._request_args(user_prompt), timeout=self.timeout)
+        except anthropic.APITimeoutError:
+            raise TimeoutException("Timed out!")
+
+        self._report_cost(response)
+        return response.content[0].text.strip()
+
+    @cached_call
+    @api_retry(RETRYABLE_ERRORS)
+    @rate_limited
+    async def _complete_async(self, user_prompt):
+        """Async counterpart of _complete."""
+        try:
+            response = await asyncio.wait_for(
+                self.async_client.messages.create(**self._request_args(user_prompt)),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutException("Timed out!")
+
+        self._report_cost(response)
+        return response.content[0].text.strip()
+
+    def _request_args(self, user_prompt):
+        """Build the Messages API arguments for a request."""
+        return {
+            "model": self.model_name,
+            "max_tokens": self.max_tokens,
+            "system": self._static_system_block,
+            "messages": [
+                {"role": "user", "content": user_prompt}
+            ],
+            "temperature": self.temperature
+        }
+
+    def _report_cost(self, response):
+        """Log the token usage and estimated cost of a response at debug level."""
+        try:
+            usage = getattr(response, 'usage', None)
+            if usage:
+                input_tokens = getattr(usage, 'input_tokens', 0)
+                output_tokens = getattr(usage, 'output_tokens', 0)
+            else:
+                # fallback for dict-like response
+                input_tokens = response.get('usage', {}).get('input_tokens', 0)
+                output_tokens = response.get('usage', {}).get('output_tokens', 0)
+
+            # Pricing per 1k tokens (as of June 2024)
+            model_prices = {
+                # Claude 3
+                'claude-3-opus-20240229': (0.015, 0.075),
+                'claude-3-sonnet-20240229': (0.003, 0.015),
+                'claude-3-haiku-20240307': (0.00025, 0.00125),
+                # Claude 3.5
+                'claude-3-5-sonnet-20240620': (0.003, 0.015),
+                'claude-3-5-sonnet-20241022': (0.003, 0.015),
+                'claude-3-5-haiku-20241022': (0.0008, 0.004),
+                # Claude 3.7
+                'claude-3-7-sonnet-20250219': (0.003, 0.015),
+                # Claude 4
+                'claude-opus-4-20250514': (0.015, 0.075),
+                'claude-sonnet-4-20250514': (0.003, 0.015),
+            }
+            # Default to Sonnet pricing if model not found
+            input_price, output_price = model_prices.get(self.model_name, (0.003, 0.015))
+            cost = (input_tokens / 1000) * input_price + (output_tokens / 1000) * output_price
+            if Logger.is_debug_enabled():
+                Logger.debug(
+                    f"Token usage: input={input_tokens}, output={output_tokens}; "
+                    f"estimated cost ${cost:.6f} (model: {self.model_name})"
+                )
+        except Exception as e:
+            Logger.warning(f"Cost calculation error: {e}")
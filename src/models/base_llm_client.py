@@ -1,9 +1,31 @@
 from abc import ABC, abstractmethod
+import json
 from typing import Dict, List, Optional, Tuple, Union
 
+# Canned raw responses returned by clients in test mode
+MOCK_TRIPLES_RESPONSE = json.dumps([
+    {"subject": "marie curie", "predicate": "discovered", "object": "radium"},
+    {"subject": "marie curie", "predicate": "won", "object": "nobel prize in physics"}
+])
+MOCK_JSONLD_RESPONSE = json.dumps({
+    "@graph": [{
+        "@id": "person:marie_curie",
+        "@type": "Person",
+        "name": "Marie Curie",
+        "discovered": [{
+            "@id": "element:radium",
+            "@type": "Discovery",
+            "name": "Radium"
+        }]
+    }]
+})
+
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
     
+    # Whether extract_triples_batch_async is implemented
+    supports_batch = False
+    
     @abstractmethod
     def __init__(
         self, 
@@ -11,7 +33,10 @@ class BaseLLMClient(ABC):
         temperature: float = None, 
         max_tokens: int = None,
         system_prompt: str = None,
-        user_prompt_template: str = None
+        user_prompt_template: str = None,
+        llm_cache=None,
+        rate_limiter=None,
+        http_client=None
     ):
         """
         Initialize the LLM client.
@@ -22,23 +47,70 @@ class BaseLLMClient(ABC):
             max_tokens: Optional maximum tokens to use
             system_prompt: Optional system prompt to use
             user_prompt_template: Optional user prompt template to use
+            llm_cache: Optional LLMCache of raw responses
+            rate_limiter: Optional RateLimiter shared by all requests
+            http_client: Optional httpx.AsyncClient for the async API calls
         """
         pass
         
     @abstractmethod
-    def extract_triples(self, user_prompt: str, chunk_number: int) -> Tuple[bool, Union[List[Dict], Dict, str], Optional[str]]:
+    def extract_triples(self, user_prompt: str, chunk_number: int) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Extract information from a text chunk using the LLM.
         
+        The response is returned as raw text; parsing is left to the
+        extractor's response parser.
+        
         Args:
             user_prompt (str): The fully formatted user prompt
             chunk_number (int): The chunk number for tracking
             
         Returns:
-            tuple: (success, result, error_message)
-            - success (bool): Whether the extraction was successful
-            - result: For triple extraction: List of dicts with subject/predicate/object
-                     For JSON-LD: Dict containing JSON-LD data or string containing JSON-LD
+            tuple: (success, llm_output, error_message)
+            - success (bool): Whether the request returned a non-empty response
+            - llm_output (str): Raw response text
             - error_message (str): Error message if unsuccessful
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    def warm_up(self) -> None:
+        """
+        Establish connections to the provider before the first request.
+        
+        Optional hook; the default implementation does nothing.
+        """
+        pass
+    
+    async def extract_triples_async(self, user_prompt: str, chunk_number: int) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Asynchronous counterpart of extract_triples.
+        
+        Clients backed by an async SDK should override this so that several
+        chunks can be in flight at once. The default implementation simply
+        delegates to the blocking extract_triples.
+        
+        Args:
+            user_prompt (str): The fully formatted user prompt
+            chunk_number (int): The chunk number for tracking
+            
+        Returns:
+            tuple: (success, llm_output, error_message)
+        """
+        return self.extract_triples(user_prompt, chunk_number)
+    
+    async def extract_triples_batch_async(self, user_prompt: str, chunk_numbers: List[int]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Extract triples for several chunks with a single request.
+        
+        Only available when supports_batch is True.
+        
+        Args:
+            user_prompt (str): User prompt containing every chunk, each
+                introduced by a "### CHUNK <chunk number>" header
+            chunk_numbers (List[int]): The chunk numbers in the prompt
+            
+        Returns:
+            tuple: (success, llm_output, error_message), where llm_output
+            groups the triples by chunk id
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batched extraction")
@@ -1,22 +1,161 @@
+import atexit
+import functools
 import openai
-import time
+import httpx
+import ijson
 import json
 import os
-from src.models.base_llm_client import BaseLLMClient
+from src.models.base_llm_client import BaseLLMClient, MOCK_TRIPLES_RESPONSE, MOCK_JSONLD_RESPONSE
 from src.config.settings import (
     OPENAI_API_KEY,
     OPENAI_API_BASE
 )
-from typing import List, Dict
+from src.utils.logger import Logger
+from src.utils.llm_cache import LLMCache, cached_call
+from src.models.retry import api_retry
+from src.models.rate_limiter import RateLimiter, rate_limited
+from typing import List, Dict, Optional
+
+# Connection pool settings shared by the sync and async HTTP clients
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+# Process-wide HTTP/2 client so every OpenAIClient reuses warm connections
+_HTTP_CLIENT = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+atexit.register(_HTTP_CLIENT.close)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_openai_client(base_url, api_key):
+    """
+    Return the shared synchronous SDK client for an endpoint and API key.
+    
+    Every OpenAIClient (and so every pipeline) in the process talks to an
+    endpoint through the same SDK client instead of building its own.
+    Async clients are not pooled because their connections are bound to
+    the event loop that opened them.
+    """
+    return openai.OpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=_HTTP_CLIENT,
+        max_retries=0  # retries are handled by api_retry
+    )
+
+
+# How much of a streamed triple response may arrive (in characters, roughly
+# 200 tokens) before it must have produced a triple key
+STREAM_HEAD_BUDGET = 800
+
+
+# Failures worth retrying: rate limits, dropped connections and 5xx errors
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+_TRIPLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "subject": {"type": "string"},
+        "predicate": {"type": "string"},
+        "object": {"type": "string"}
+    },
+    "required": ["subject", "predicate", "object"],
+    "additionalProperties": False
+}
+
+# Structured output format for batched requests: triples grouped by chunk id
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "batched_triples",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "chunks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "chunk_id": {"type": "integer"},
+                            "triples": {"type": "array", "items": _TRIPLE_SCHEMA}
+                        },
+                        "required": ["chunk_id", "triples"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["chunks"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+class MalformedResponseError(Exception):
+    pass
+
+
+class _StreamShapeGuard:
+    """
+    Incrementally checks a streamed response so generation can be cancelled
+    as soon as the output is clearly not the JSON we asked for.
+    """
+
+    def __init__(self, expected_keys=None, head_budget=STREAM_HEAD_BUDGET):
+        """
+        Args:
+            expected_keys: Object keys that must appear within the head budget,
+                or None to only check JSON syntax
+            head_budget: Number of characters allowed before a key is seen
+        """
+        self.expected_keys = expected_keys
+        self.head_budget = head_budget
+        self.received = 0
+        self.seen_expected_key = expected_keys is None
+        self._events = ijson.sendable_list()
+        self._parser = ijson.basic_parse_coro(self._events)
+
+    def feed(self, text):
+        """
+        Feed the next piece of the response.
+        
+        Raises:
+            MalformedResponseError: If the response can't be the expected JSON
+        """
+        self.received += len(text)
+        try:
+            self._parser.send(text.encode("utf-8"))
+        except ijson.JSONError as e:
+            raise MalformedResponseError(f"Response is not valid JSON: {str(e)}")
+        
+        if not self.seen_expected_key:
+            for event, value in self._events:
+                if event == "map_key" and value in self.expected_keys:
+                    self.seen_expected_key = True
+                    break
+            del self._events[:]
+            if not self.seen_expected_key and self.received > self.head_budget:
+                raise MalformedResponseError(
+                    f"No triple found in the first {self.received} characters of the response"
+                )
+        else:
+            del self._events[:]
+
 
 class OpenAIClient(BaseLLMClient):
+    supports_batch = True
+    
     def __init__(
         self, 
         model_name: str = None, 
         temperature: float = None, 
         max_tokens: int = None,
         system_prompt: str = None,
-        user_prompt_template: str = None
+        user_prompt_template: str = None,
+        llm_cache: Optional[LLMCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the OpenAI client.
@@ -27,6 +166,9 @@ class OpenAIClient(BaseLLMClient):
             max_tokens: Maximum tokens to use
             system_prompt: System prompt to use
             user_prompt_template: User prompt template to use
+            llm_cache: Optional persistent cache of raw responses
+            rate_limiter: Optional request/token budget shared by all requests
+            http_client: Optional shared connection pool for async requests
         """
         # Use provided values or fall back to environment variables
         self.api_key = os.getenv("OPENAI_API_KEY") or OPENAI_API_KEY
@@ -37,9 +179,16 @@ class OpenAIClient(BaseLLMClient):
         self.is_test_mode = self.api_key == "test-key"
         
         if not self.is_test_mode:
-            self.client = openai.OpenAI(
-                base_url=os.getenv("OPENAI_API_BASE") or OPENAI_API_BASE,
-                api_key=self.api_key
+            base_url = os.getenv("OPENAI_API_BASE") or OPENAI_API_BASE
+            self.client = _get_openai_client(base_url, self.api_key)
+            # Async connections are bound to the event loop that opened them,
+            # so the async client uses the caller's pool or the SDK's default,
+            # which the SDK closes itself.
+            self.async_client = openai.AsyncOpenAI(
+                base_url=base_url,
+                api_key=self.api_key,
+                http_client=http_client,
+                max_retries=0
             )
             
         # Use provided values (no fallbacks to settings)
@@ -48,12 +197,29 @@ class OpenAIClient(BaseLLMClient):
         self.max_tokens = max_tokens
         self.system_prompt = system_prompt
         self.user_prompt_template = user_prompt_template
+        self.llm_cache = llm_cache
+        self.rate_limiter = rate_limiter
         
-        print(f"\nOpenAI client initialized with:")
-        print(f"Model: {self.model_name}")
-        print(f"Temperature: {self.temperature}")
-        print(f"System prompt length: {len(self.system_prompt)}")
-        print(f"User prompt template length: {len(self.user_prompt_template)}")
+        if Logger.is_debug_enabled():
+            Logger.debug(
+                f"OpenAI client initialized with model {self.model_name}, "
+                f"temperature {self.temperature}, "
+                f"system prompt length {self._system_prompt_length}, "
+                f"user prompt template length {len(self.user_prompt_template)}"
+            )
+
+    @property
+    def system_prompt(self):
+        """The system prompt sent with every request."""
+        return self._system_prompt
+
+    @system_prompt.setter
+    def system_prompt(self, value):
+        self._system_prompt = value
+        # Built once so every request starts with an identical prefix, which
+        # lets OpenAI's automatic prompt caching reuse it across chunks.
+        self._static_system_block = {"role": "system", "content": value}
+        self._system_prompt_length = len(value) if value else 0
 
     def extract_triples(self, user_prompt, chunk_number):
         """
@@ -64,116 +230,218 @@ class OpenAIClient(BaseLLMClient):
             chunk_number (int): The chunk number for tracking
         
         Returns:
-            tuple: (success, result, error_message)
-            - success (bool): Whether the extraction was successful
-            - result: For triple extraction: List of dicts with subject/predicate/object
-                     For JSON-LD: Dict containing JSON-LD data or string containing JSON-LD
+            tuple: (success, llm_output, error_message)
+            - success (bool): Whether a non-empty response was received
+            - llm_output (str): Raw response text, parsed by the extractor
             - error_message (str): Error message if unsuccessful
         """
         if self.is_test_mode:
-            # Return mock data for testing
-            if "JSON-LD" in self.system_prompt:
-                # Return mock JSON-LD data
-                return True, {
-                    "@graph": [{
-                        "@id": "person:marie_curie",
-                        "@type": "Person",
-                        "name": "Marie Curie",
-                        "discovered": [{
-                            "@id": "element:radium",
-                            "@type": "Discovery",
-                            "name": "Radium"
-                        }]
-                    }]
-                }, None
-            else:
-                # Return mock triple data
-                return True, [
-                    {
-                        "subject": "marie curie",
-                        "predicate": "discovered",
-                        "object": "radium",
-                        "chunk": chunk_number
-                    },
-                    {
-                        "subject": "marie curie",
-                        "predicate": "won",
-                        "object": "nobel prize in physics",
-                        "chunk": chunk_number
-                    }
-                ], None
+            return self._mock_response(chunk_number)
         
         try:
-            print(f"\nMaking API call to OpenAI for chunk {chunk_number}...")
-            print(f"Using model: {self.model_name}")
-            print(f"System prompt length: {len(self.system_prompt)}")
-            print(f"User prompt length: {len(user_prompt)}")
-            
-            # Make the API call
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
-            )
+            self._log_request(user_prompt, chunk_number)
             
-            print(f"Received response from OpenAI for chunk {chunk_number}")
+            llm_output = self._complete(user_prompt)
             
-            # Extract and parse the response
-            llm_output = response.choices[0].message.content.strip()
-            if not llm_output:
-                return False, None, "Empty response from LLM"
-                
-            # Parse the JSON response
-            try:
-                parsed_data = json.loads(llm_output)
+            return self._raw_result(llm_output, chunk_number)
                 
-                # Check if we're in JSON-LD mode
-                if "JSON-LD" in self.system_prompt:
-                    # Return the JSON-LD data directly
-                    return True, parsed_data, None
-                else:
-                    # Handle triple extraction format
-                    if isinstance(parsed_data, dict):
-                        # Check if this is a single triple object
-                        if all(k in parsed_data for k in ['subject', 'predicate', 'object']):
-                            parsed_json = [parsed_data]  # Wrap single triple in array
-                        else:
-                            list_values = [v for v in parsed_data.values() if isinstance(v, list)]
-                            if len(list_values) == 1:
-                                parsed_json = list_values[0]
-                            else:
-                                return False, None, "JSON object received, but doesn't contain a single list of triples"
-                    elif isinstance(parsed_data, list):
-                        parsed_json = parsed_data
-                    else:
-                        return False, None, "Parsed JSON is not a list or expected dictionary wrapper"
-                    
-                    # Validate and extract triples
-                    valid_triples = []
-                    for item in parsed_json:
-                        if isinstance(item, dict) and all(k in item for k in ['subject', 'predicate', 'object']):
-                            if all(isinstance(item[k], str) for k in ['subject', 'predicate', 'object']):
-                                item['chunk'] = chunk_number
-                                valid_triples.append(item)
-                    
-                    print(f"Successfully parsed {len(valid_triples)} triples from response")
-                    return True, valid_triples, None
+        except Exception as e:
+            return False, None, self._error_message(e, chunk_number)
+
+    async def extract_triples_async(self, user_prompt, chunk_number):
+        """
+        Extract information from a text chunk using the async OpenAI API.
+        
+        Lets the pipeline keep several chunk requests in flight at once
+        instead of waiting for each round-trip in turn.
+        
+        Args:
+            user_prompt (str): The fully formatted user prompt
+            chunk_number (int): The chunk number for tracking
+        
+        Returns:
+            tuple: (success, llm_output, error_message), as for extract_triples
+        """
+        if self.is_test_mode:
+            return self._mock_response(chunk_number)
+        
+        try:
+            self._log_request(user_prompt, chunk_number)
+            
+            llm_output = await self._complete_async(user_prompt)
+            
+            return self._raw_result(llm_output, chunk_number)
                 
-            except json.JSONDecodeError as json_err:
-                print(f"JSON parsing error: {str(json_err)}")
-                return False, None, f"JSON parsing error: {str(json_err)}"
+        except Exception as e:
+            return False, None, self._error_message(e, chunk_number)
+
+    async def extract_triples_batch_async(self, user_prompt, chunk_numbers):
+        """
+        Extract triples for several chunks with a single API request.
+        
+        The response is constrained to BATCH_RESPONSE_FORMAT so it can be
+        split back into per-chunk results deterministically.
+        
+        Args:
+            user_prompt (str): User prompt containing every chunk, each
+                introduced by a "### CHUNK <chunk number>" header
+            chunk_numbers (List[int]): The chunk numbers in the prompt
+        
+        Returns:
+            tuple: (success, llm_output, error_message)
+        """
+        if self.is_test_mode:
+            triples = json.loads(MOCK_TRIPLES_RESPONSE)
+            return True, json.dumps({"chunks": [{"chunk_id": n, "triples": triples} for n in chunk_numbers]}), None
+        
+        try:
+            self._log_request(user_prompt, chunk_numbers)
+            
+            llm_output = await self._complete_batch_async(user_prompt)
+            
+            return self._raw_result(llm_output, chunk_numbers)
                 
-        except openai.APIError as e:
-            print(f"OpenAI API Error: {str(e)}")
-            return False, None, f"OpenAI API Error: {str(e)}"
-        except openai.RateLimitError as e:
-            print(f"Rate limit exceeded: {str(e)}")
-            time.sleep(60)  # Wait before retrying
-            return False, None, f"Rate limit exceeded: {str(e)}"
         except Exception as e:
-            print(f"Unexpected error: {str(e)}")
-            return False, None, f"Unexpected error: {str(e)}" 
\ No newline at end of file
+            return False, None, self._error_message(e, chunk_numbers)
+
+    def warm_up(self):
+        """Open a connection to the API ahead of the first extraction request."""
+        if self.is_test_mode:
+            return
+        try:
+            self.client.models.list()
+        except Exception as e:
+            Logger.warning(f"OpenAI connection warm-up failed: {str(e)}")
+
+    @cached_call
+    @api_retry(RETRYABLE_ERRORS)
+    @rate_limited
+    def _complete(self, user_prompt):
+        """
+        Send a prompt to the API and return the raw response text.
+        
+        The response is streamed and checked as it arrives; generation is
+        cancelled as soon as the output can't be the requested JSON.
+        
+        Args:
+            user_prompt (str): The fully formatted user prompt
+        
+        Returns:
+            str: The stripped response content
+        
+        Transient failures (rate limits, connection errors, 5xx) are retried
+        with exponential backoff, honoring Retry-After.
+        
+        Raises:
+            MalformedResponseError: If the response was aborted early
+        """
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=self._build_messages(user_prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+        guard = self._new_stream_guard()
+        parts = []
+        try:
+            for event in stream:
+                delta = event.choices[0].delta.content if event.choices else None
+                if delta:
+                    parts.append(delta)
+                    guard.feed(delta)
+        except MalformedResponseError:
+            stream.close()
+            raise
+        return "".join(parts).strip()
+
+    @cached_call
+    @api_retry(RETRYABLE_ERRORS)
+    @rate_limited
+    async def _complete_async(self, user_prompt):
+        """Async counterpart of _complete."""
+        stream = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self._build_messages(user_prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True
+        )
+        guard = self._new_stream_guard()
+        parts = []
+        try:
+            async for event in stream:
+                delta = event.choices[0].delta.content if event.choices else None
+                if delta:
+                    parts.append(delta)
+                    guard.feed(delta)
+        except MalformedResponseError:
+            await stream.close()
+            raise
+        return "".join(parts).strip()
+
+    @cached_call
+    @api_retry(RETRYABLE_ERRORS)
+    @rate_limited
+    async def _complete_batch_async(self, user_prompt):
+        """Send a batched prompt with structured output and return the raw response text."""
+        response = await self.async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self._build_messages(user_prompt),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            response_format=BATCH_RESPONSE_FORMAT
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    def _error_message(self, error, chunk_number):
+        """Log a failed request and return its error message."""
+        if isinstance(error, MalformedResponseError):
+            Logger.warning(f"Aborted response for chunk {chunk_number}: {str(error)}")
+            return f"Malformed response: {str(error)}"
+        if isinstance(error, openai.RateLimitError):
+            Logger.warning(f"Rate limit exceeded: {str(error)}")
+            return f"Rate limit exceeded: {str(error)}"
+        if isinstance(error, openai.APIError):
+            Logger.error(f"OpenAI API Error: {str(error)}")
+            return f"OpenAI API Error: {str(error)}"
+        Logger.error(f"Unexpected error: {str(error)}")
+        return f"Unexpected error: {str(error)}"
+
+    def _new_stream_guard(self):
+        """Create a guard for the response shape expected in this mode."""
+        if "JSON-LD" in self.system_prompt:
+            # JSON-LD output may start with a long @context, so only check syntax
+            return _StreamShapeGuard()
+        return _StreamShapeGuard(expected_keys=("subject", "predicate", "object"))
+
+    def _build_messages(self, user_prompt):
+        """Build the chat messages for a request."""
+        return [
+            self._static_system_block,
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def _log_request(self, user_prompt, chunk_number):
+        """Log details about an outgoing request at debug level."""
+        if Logger.is_debug_enabled():
+            Logger.debug(
+                f"Making API call to OpenAI for chunk {chunk_number} "
+                f"(model {self.model_name}, system prompt length {self._system_prompt_length}, "
+                f"user prompt length {len(user_prompt)})"
+            )
+
+    def _mock_response(self, chunk_number):
+        """Return a canned raw response for test mode."""
+        if "JSON-LD" in self.system_prompt:
+            return True, MOCK_JSONLD_RESPONSE, None
+        return True, MOCK_TRIPLES_RESPONSE, None
+
+    def _raw_result(self, llm_output, chunk_number):
+        """Wrap the raw response text in the client's result tuple."""
+        if Logger.is_debug_enabled():
+            Logger.debug(f"Received response from OpenAI for chunk {chunk_number}")
+        
+        if not llm_output:
+            return False, None, "Empty response from LLM"
+        return True, llm_output, None
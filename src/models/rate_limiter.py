@@ -0,0 +1,188 @@
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from typing import Callable, Optional
+
+from src.models.retry import retry_after_seconds
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+# How long every request pauses after the provider reports a rate limit,
+# when the response doesn't say how long to wait
+RATE_LIMIT_COOLDOWN_SECONDS = 15.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class RateLimiter:
+    """
+    Client-side request and token budget for an LLM API.
+
+    Keeps one bucket of request capacity and one of token capacity, each
+    refilled continuously at the configured per-minute rate (the scheme
+    used by OpenAI's api_request_parallel_processor). A request is only
+    dispatched once both buckets can cover it, so bursts stay within the
+    provider's limits instead of being rejected with 429s. After a 429, all
+    requests pause for a cooldown period.
+
+    Safe to share between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget, or None for no limit
+            tokens_per_minute: Token budget, or None for no limit
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = requests_per_minute or 0.0
+        self.available_token_capacity = tokens_per_minute or 0.0
+        self._last_update = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Replenish both buckets for the time elapsed since the last update."""
+        elapsed = now - self._last_update
+        self._last_update = now
+        if self.requests_per_minute:
+            self.available_request_capacity = min(
+                self.available_request_capacity + self.requests_per_minute * elapsed / 60.0,
+                self.requests_per_minute
+            )
+        if self.tokens_per_minute:
+            self.available_token_capacity = min(
+                self.available_token_capacity + self.tokens_per_minute * elapsed / 60.0,
+                self.tokens_per_minute
+            )
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Take capacity for one request if available.
+
+        Returns:
+            0 if the request may proceed, otherwise the number of seconds to
+            wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if now < self._cooldown_until:
+                return self._cooldown_until - now
+
+            # A request larger than the whole token budget waits for a full bucket
+            if self.tokens_per_minute:
+                tokens = min(tokens, self.tokens_per_minute)
+
+            wait = 0.0
+            if self.requests_per_minute and self.available_request_capacity < 1:
+                wait = max(wait, (1 - self.available_request_capacity) * 60.0 / self.requests_per_minute)
+            if self.tokens_per_minute and self.available_token_capacity < tokens:
+                wait = max(wait, (tokens - self.available_token_capacity) * 60.0 / self.tokens_per_minute)
+            if wait > 0:
+                return wait
+
+            if self.requests_per_minute:
+                self.available_request_capacity -= 1
+            if self.tokens_per_minute:
+                self.available_token_capacity -= tokens
+            return 0.0
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request of the given size fits in the budget.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the request
+        """
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, tokens: int = 0) -> None:
+        """Blocking counterpart of acquire."""
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def cool_down(self, seconds: Optional[float] = None) -> None:
+        """
+        Pause all requests after the provider reported a rate limit.
+
+        Args:
+            seconds: Pause length, defaulting to RATE_LIMIT_COOLDOWN_SECONDS
+        """
+        with self._lock:
+            until = time.monotonic() + (seconds if seconds is not None else RATE_LIMIT_COOLDOWN_SECONDS)
+            self._cooldown_until = max(self._cooldown_until, until)
+
+
+def _is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an SDK error is an HTTP 429 response."""
+    return getattr(error, "status_code", None) == 429
+
+
+def rate_limited(method: Callable) -> Callable:
+    """
+    Decorate an LLM client method that sends one request for a prompt.
+
+    The decorated method must take the user prompt as its first argument.
+    If the client's ``rate_limiter`` attribute is set, each call first
+    waits for request and token capacity (prompt estimate plus the
+    client's max_tokens), and a 429 response pauses all requests. Apply
+    it inside the retry decorator so every attempt is accounted for.
+    Both regular and ``async`` methods are supported.
+    """
+    def _tokens(client, user_prompt: str) -> int:
+        return estimate_tokens(client.system_prompt) + estimate_tokens(user_prompt) + (client.max_tokens or 0)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(client, user_prompt, *args, **kwargs):
+            limiter = getattr(client, "rate_limiter", None)
+            if limiter is None:
+                return await method(client, user_prompt, *args, **kwargs)
+
+            await limiter.acquire(_tokens(client, user_prompt))
+            try:
+                return await method(client, user_prompt, *args, **kwargs)
+            except Exception as e:
+                if _is_rate_limit_error(e):
+                    limiter.cool_down(retry_after_seconds(e))
+                raise
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(client, user_prompt, *args, **kwargs):
+        limiter = getattr(client, "rate_limiter", None)
+        if limiter is None:
+            return method(client, user_prompt, *args, **kwargs)
+
+        limiter.acquire_sync(_tokens(client, user_prompt))
+        try:
+            return method(client, user_prompt, *args, **kwargs)
+        except Exception as e:
+            if _is_rate_limit_error(e):
+                limiter.cool_down(retry_after_seconds(e))
+            raise
+
+    return wrapper
@@ -1,8 +1,33 @@
-import json
+import sys
+import msgspec
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Union, Tuple
 from src.utils.logger import Logger
 
+# Triple keys, interned so the per-item dict builds and lookups below hash once
+SUBJECT = sys.intern('subject')
+PREDICATE = sys.intern('predicate')
+OBJECT = sys.intern('object')
+CHUNK = sys.intern('chunk')
+
+
+class Triple(msgspec.Struct, frozen=True):
+    """Schema of a single triple in an LLM response."""
+    subject: str
+    predicate: str
+    object: str
+
+
+class ChunkTriples(msgspec.Struct):
+    """Triples for one chunk of a batched response."""
+    chunk_id: int
+    triples: List[Triple]
+
+
+class BatchResponse(msgspec.Struct):
+    """Schema of a batched triple extraction response."""
+    chunks: List[ChunkTriples]
+
 
 class BaseResponseParser(ABC):
     """Abstract base class for response parsers."""
@@ -25,6 +50,12 @@ class BaseResponseParser(ABC):
 class TripleResponseParser(BaseResponseParser):
     """Parser for triple extraction responses."""
     
+    # Built once: a Decoder specialized for the expected schema validates
+    # while decoding, without per-call type resolution
+    _triples_decoder = msgspec.json.Decoder(List[Triple])
+    _batch_decoder = msgspec.json.Decoder(BatchResponse)
+    _any_decoder = msgspec.json.Decoder()
+    
     def parse(self, response: str, chunk_number: int) -> Tuple[bool, List[Dict], Optional[str]]:
         """
         Parse triple extraction response.
@@ -40,38 +71,27 @@ class TripleResponseParser(BaseResponseParser):
             if not response.strip():
                 return False, [], "Empty response from LLM"
             
-            # Parse the JSON response
-            parsed_data = json.loads(response)
+            # Fast path: a well-formed array of triples is decoded and
+            # type-checked in a single pass
+            try:
+                triples = self._triples_decoder.decode(response)
+            except msgspec.ValidationError:
+                triples = None
             
-            # Handle different response formats
-            if isinstance(parsed_data, dict):
-                # Check if this is a single triple object
-                if all(k in parsed_data for k in ['subject', 'predicate', 'object']):
-                    parsed_json = [parsed_data]
-                else:
-                    # Look for a list of triples in the dictionary
-                    list_values = [v for v in parsed_data.values() if isinstance(v, list)]
-                    if len(list_values) == 1:
-                        parsed_json = list_values[0]
-                    else:
-                        return False, [], "JSON object received, but doesn't contain a single list of triples"
-            elif isinstance(parsed_data, list):
-                parsed_json = parsed_data
+            if triples is not None:
+                valid_triples = [
+                    {SUBJECT: t.subject, PREDICATE: t.predicate, OBJECT: t.object, CHUNK: chunk_number}
+                    for t in triples
+                ]
             else:
-                return False, [], "Parsed JSON is not a list or expected dictionary wrapper"
-            
-            # Validate and extract triples
-            valid_triples = []
-            for item in parsed_json:
-                if isinstance(item, dict) and all(k in item for k in ['subject', 'predicate', 'object']):
-                    if all(isinstance(item[k], str) for k in ['subject', 'predicate', 'object']):
-                        item['chunk'] = chunk_number
-                        valid_triples.append(item)
+                valid_triples, error = self._parse_loose(self._any_decoder.decode(response), chunk_number)
+                if error:
+                    return False, [], error
             
-            Logger.info(f"Successfully parsed {len(valid_triples)} triples from chunk {chunk_number}")
+            Logger.debug(f"Successfully parsed {len(valid_triples)} triples from chunk {chunk_number}")
             return True, valid_triples, None
             
-        except json.JSONDecodeError as json_err:
+        except msgspec.DecodeError as json_err:
             error_msg = f"JSON parsing error: {str(json_err)}"
             Logger.error(error_msg)
             return False, [], error_msg
@@ -79,11 +99,94 @@ class TripleResponseParser(BaseResponseParser):
             error_msg = f"Unexpected parsing error: {str(e)}"
             Logger.error(error_msg)
             return False, [], error_msg
+    
+    def parse_batch(self, response: str, chunk_numbers: List[int]) -> Dict[int, Tuple[bool, List[Dict], Optional[str]]]:
+        """
+        Parse a response covering several chunks.
+        
+        Args:
+            response: Raw response from LLM, matching BatchResponse
+            chunk_numbers: Chunk numbers included in the request
+            
+        Returns:
+            Mapping of chunk number to (success, triples, error_message)
+        """
+        try:
+            if not response.strip():
+                raise ValueError("Empty response from LLM")
+            batch = self._batch_decoder.decode(response)
+        except Exception as e:
+            error_msg = f"Batch response parsing error: {str(e)}"
+            Logger.error(error_msg)
+            return {n: (False, [], error_msg) for n in chunk_numbers}
+        
+        triples_by_chunk = {entry.chunk_id: entry.triples for entry in batch.chunks}
+        results = {}
+        for chunk_number in chunk_numbers:
+            triples = triples_by_chunk.get(chunk_number)
+            if triples is None:
+                results[chunk_number] = (False, [], f"Chunk {chunk_number} missing from batch response")
+                continue
+            results[chunk_number] = (True, [
+                {SUBJECT: t.subject, PREDICATE: t.predicate, OBJECT: t.object, CHUNK: chunk_number}
+                for t in triples
+            ], None)
+        
+        Logger.debug(f"Successfully parsed batch response for chunks {chunk_numbers}")
+        return results
+    
+    def _parse_loose(self, parsed_data, chunk_number: int) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Extract triples from a response that isn't a plain array of triples.
+        
+        Accepts a single triple object, an object wrapping one list of
+        triples, or an array containing some malformed items (which are
+        skipped).
+        
+        Args:
+            parsed_data: Decoded JSON response
+            chunk_number: Chunk number for tracking
+            
+        Returns:
+            tuple: (triples, error_message)
+        """
+        # Handle different response formats
+        if isinstance(parsed_data, dict):
+            # Check if this is a single triple object
+            if SUBJECT in parsed_data and PREDICATE in parsed_data and OBJECT in parsed_data:
+                parsed_json = [parsed_data]
+            else:
+                # Look for a list of triples in the dictionary
+                list_values = [v for v in parsed_data.values() if isinstance(v, list)]
+                if len(list_values) == 1:
+                    parsed_json = list_values[0]
+                else:
+                    return [], "JSON object received, but doesn't contain a single list of triples"
+        elif isinstance(parsed_data, list):
+            parsed_json = parsed_data
+        else:
+            return [], "Parsed JSON is not a list or expected dictionary wrapper"
+        
+        # Validate and extract triples; items with a missing or non-string
+        # field are skipped
+        valid_triples = []
+        append = valid_triples.append
+        for item in parsed_json:
+            if type(item) is not dict:
+                continue
+            get = item.get
+            s, p, o = get(SUBJECT), get(PREDICATE), get(OBJECT)
+            if type(s) is str and type(p) is str and type(o) is str:
+                append({SUBJECT: s, PREDICATE: p, OBJECT: o, CHUNK: chunk_number})
+        
+        return valid_triples, None
 
 
 class JSONLDResponseParser(BaseResponseParser):
     """Parser for JSON-LD extraction responses."""
     
+    _decoder = msgspec.json.Decoder()
+    
     def parse(self, response: str, chunk_number: int) -> Tuple[bool, Dict, Optional[str]]:
         """
         Parse JSON-LD extraction response.
@@ -100,19 +203,19 @@ class JSONLDResponseParser(BaseResponseParser):
                 return False, {}, "Empty response from LLM"
             
             # Parse the JSON response
-            parsed_data = json.loads(response)
+            parsed_data = self._decoder.decode(response)
             
             # Validate JSON-LD structure
             if isinstance(parsed_data, dict):
                 if "@graph" in parsed_data:
-                    Logger.info(f"Successfully parsed JSON-LD from chunk {chunk_number}")
+                    Logger.debug(f"Successfully parsed JSON-LD from chunk {chunk_number}")
                     return True, parsed_data, None
                 else:
                     return False, {}, "JSON-LD response missing @graph key"
             else:
                 return False, {}, "Parsed JSON is not a dictionary"
                 
-        except json.JSONDecodeError as json_err:
+        except msgspec.DecodeError as json_err:
             error_msg = f"JSON parsing error: {str(json_err)}"
             Logger.error(error_msg)
             return False, {}, error_msg
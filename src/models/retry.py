@@ -0,0 +1,104 @@
+from typing import Optional, Tuple, Type
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_random_exponential
+)
+from tenacity.wait import wait_base
+from src.utils.logger import Logger
+
+# Retry settings for transient API failures
+MAX_ATTEMPTS = 6
+MAX_WAIT_SECONDS = 60.0
+
+
+def retry_after_seconds(exception: Optional[BaseException]) -> Optional[float]:
+    """
+    Read the Retry-After header from a failed API request.
+
+    Args:
+        exception: Error raised by the SDK
+
+    Returns:
+        The requested delay in seconds, or None if there is no usable header
+    """
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+    return None
+
+
+class wait_retry_after(wait_base):
+    """
+    Wait strategy that honors the server's Retry-After header.
+
+    Falls back to the given strategy when the failed request carries no
+    usable header.
+    """
+
+    def __init__(self, fallback: wait_base, max_wait: float = MAX_WAIT_SECONDS):
+        self.fallback = fallback
+        self.max_wait = max_wait
+
+    def __call__(self, retry_state) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        retry_after = retry_after_seconds(exception)
+        if retry_after is not None:
+            return min(retry_after, self.max_wait)
+        return self.fallback(retry_state)
+
+
+def _retry_logger(max_attempts: int):
+    """Build a before_sleep callback that logs a retry."""
+    def _log_retry(retry_state) -> None:
+        exception = retry_state.outcome.exception()
+        Logger.warning(
+            f"Transient API error ({type(exception).__name__}: {str(exception)}); "
+            f"retrying in {retry_state.next_action.sleep:.1f}s "
+            f"(attempt {retry_state.attempt_number}/{max_attempts})"
+        )
+    return _log_retry
+
+
+def api_retry(
+    retryable: Tuple[Type[BaseException], ...],
+    max_attempts: int = MAX_ATTEMPTS,
+    max_wait: float = MAX_WAIT_SECONDS,
+    max_delay: Optional[float] = None
+):
+    """
+    Build a retry decorator for LLM API calls.
+
+    Retries the given exception types with jittered exponential backoff
+    (capped at max_wait, or the server's Retry-After) and re-raises the
+    last error after max_attempts attempts. Works for both regular and
+    async functions.
+
+    Args:
+        retryable: Exception types that indicate a transient failure
+        max_attempts: Attempts made before giving up
+        max_wait: Longest wait between two attempts, in seconds
+        max_delay: If given, no attempt is started once this many seconds
+            have passed since the first one
+
+    Returns:
+        A tenacity retry decorator
+    """
+    stop = stop_after_attempt(max_attempts)
+    if max_delay is not None:
+        stop = stop | stop_after_delay(max_delay)
+    return retry(
+        retry=retry_if_exception_type(retryable),
+        wait=wait_retry_after(wait_random_exponential(multiplier=1, max=max_wait), max_wait=max_wait),
+        stop=stop,
+        before_sleep=_retry_logger(max_attempts),
+        reraise=True
+    )
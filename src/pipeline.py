@@ -1,13 +1,22 @@
+import asyncio
+import copy
+import hashlib
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
 from pathlib import Path
 
 from src.config.configuration import Configuration
-from src.models.openai_client import OpenAIClient
+from src.models.openai_client import OpenAIClient, HTTP_LIMITS, HTTP_TIMEOUT
 from src.models.anthropic_client import AnthropicClient
-from src.processors.text_processor import TextProcessor
+from src.models.rate_limiter import RateLimiter
+from src.processors.text_processor import TextProcessor, chunk_key, chunk_text
 from src.extractors.extractor_factory import ExtractorFactory
 from src.utils.logger import Logger
-from src.utils.display_manager import DisplayManager
+from src.utils.display_manager import DisplayManager, DEFAULT_MAX_ROWS
+from src.utils.llm_cache import LLMCache
+from src.utils.semantic_cache import SemanticChunkCache
+from src.utils.result_cache import ChunkResultCache
 from src.config.settings import (
     EXTRACTION_SYSTEM_PROMPT,
     EXTRACTION_USER_PROMPT_TEMPLATE,
@@ -15,23 +24,63 @@ from src.config.settings import (
     JSONLD_USER_PROMPT_TEMPLATE
 )
 
+# Worker threads that validate and normalize responses while further
+# requests are in flight
+PARSER_THREADS = 4
+
 
 class KnowledgeGraphPipeline:
     """Simplified knowledge graph extraction pipeline using modular components."""
     
-    def __init__(self, config: Optional[Configuration] = None):
+    def __init__(
+        self,
+        config: Optional[Configuration] = None,
+        max_concurrent_requests: Optional[int] = None,
+        chunk_batch_size: Optional[int] = None,
+        use_cache: Optional[bool] = None
+    ):
         """
         Initialize the knowledge graph extraction pipeline.
         
         Args:
             config: Configuration settings. If None, loads from environment.
+            max_concurrent_requests: Maximum number of LLM requests in flight
+                at once. Overrides config.llm.max_concurrency if given.
+            chunk_batch_size: Number of chunks sent per LLM request.
+                Overrides config.extraction.batch_size if given.
+            use_cache: Whether to reuse LLM responses stored on disk by
+                earlier runs. Overrides config.llm.enable_cache if given.
+            
+        The overrides are applied to a copy of config, so other pipelines
+        built from the same config are not affected.
         """
         # Load configuration
         if config is None:
             config = Configuration.from_env()
+        elif any(override is not None for override in (max_concurrent_requests, chunk_batch_size, use_cache)):
+            # The overrides apply to this pipeline only, not to the caller's config
+            config = copy.deepcopy(config)
+        
+        if max_concurrent_requests is not None:
+            if max_concurrent_requests < 1:
+                raise ValueError(f"max_concurrent_requests must be at least 1, got {max_concurrent_requests}")
+            config.llm.max_concurrency = max_concurrent_requests
+        
+        if chunk_batch_size is not None:
+            if chunk_batch_size < 1:
+                raise ValueError(f"chunk_batch_size must be at least 1, got {chunk_batch_size}")
+            config.extraction.batch_size = chunk_batch_size
+        
+        if use_cache is not None:
+            config.llm.enable_cache = use_cache
         
         self.config = config
         
+        # Event loop backing the synchronous entry points. It is kept for the
+        # lifetime of the pipeline so that async API clients can reuse their
+        # pooled connections across calls.
+        self._loop = None
+        
         # Configure logging
         if self.config.enable_logging:
             Logger.configure(level=self.config.log_level)
@@ -40,6 +89,8 @@ class KnowledgeGraphPipeline:
         self._initialize_llm_client()
         self._initialize_text_processor()
         self._initialize_extractor()
+        self._initialize_semantic_cache()
+        self._initialize_result_cache()
         
         Logger.info("Knowledge Graph Pipeline initialized successfully")
         Logger.info(f"Using {self.config.extraction.extraction_mode} extraction mode")
@@ -56,6 +107,30 @@ class KnowledgeGraphPipeline:
             system_prompt = EXTRACTION_SYSTEM_PROMPT
             user_prompt_template = EXTRACTION_USER_PROMPT_TEMPLATE
         
+        # Persistent cache of raw responses, shared by sync and async calls.
+        # Like the other caches it is only used for deterministic output.
+        use_llm_cache = llm_config.enable_cache
+        if use_llm_cache and llm_config.temperature > 0:
+            Logger.info("LLM response cache disabled because temperature is above 0")
+            use_llm_cache = False
+        self.llm_cache = LLMCache(
+            path=llm_config.cache_path,
+            ttl=llm_config.cache_ttl,
+            disable=not use_llm_cache
+        )
+        
+        # One HTTP/2 connection pool for all async API requests, so
+        # concurrent chunks are multiplexed over warm connections
+        self.http_client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        
+        # Client-side request/token budget, so bursts don't run into 429s
+        self.rate_limiter = None
+        if llm_config.requests_per_minute or llm_config.tokens_per_minute:
+            self.rate_limiter = RateLimiter(
+                requests_per_minute=llm_config.requests_per_minute,
+                tokens_per_minute=llm_config.tokens_per_minute
+            )
+        
         # Create LLM client
         if llm_config.provider == "openai":
             self.llm_client = OpenAIClient(
@@ -63,7 +138,10 @@ class KnowledgeGraphPipeline:
                 temperature=llm_config.temperature,
                 max_tokens=llm_config.max_tokens,
                 system_prompt=system_prompt,
-                user_prompt_template=user_prompt_template
+                user_prompt_template=user_prompt_template,
+                llm_cache=self.llm_cache,
+                rate_limiter=self.rate_limiter,
+                http_client=self.http_client
             )
         elif llm_config.provider == "anthropic":
             self.llm_client = AnthropicClient(
@@ -71,18 +149,26 @@ class KnowledgeGraphPipeline:
                 temperature=llm_config.temperature,
                 max_tokens=llm_config.max_tokens,
                 system_prompt=system_prompt,
-                user_prompt_template=user_prompt_template
+                user_prompt_template=user_prompt_template,
+                llm_cache=self.llm_cache,
+                rate_limiter=self.rate_limiter,
+                http_client=self.http_client
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {llm_config.provider}")
         
+        # Pay connection setup once here rather than on the first chunk
+        self.llm_client.warm_up()
+        
         Logger.info(f"Initialized {llm_config.provider} client with model {llm_config.model_name}")
     
     def _initialize_text_processor(self):
         """Initialize the text processor."""
         self.text_processor = TextProcessor(
             chunk_size=self.config.text_processing.chunk_size,
-            overlap=self.config.text_processing.chunk_overlap
+            overlap=self.config.text_processing.chunk_overlap,
+            cache_dir=self.config.text_processing.pdf_cache_dir,
+            n_workers=self.config.text_processing.pdf_workers
         )
         Logger.info(f"Initialized text processor with chunk size {self.config.text_processing.chunk_size}")
     
@@ -94,10 +180,82 @@ class KnowledgeGraphPipeline:
         )
         Logger.info(f"Initialized {self.config.extraction.extraction_mode} extractor")
     
+    def _initialize_semantic_cache(self):
+        """Initialize the semantic chunk cache, if enabled."""
+        self.semantic_cache = None
+        extraction_config = self.config.extraction
+        if not extraction_config.enable_semantic_cache:
+            return
+        
+        # Reusing results for similar chunks only makes sense when the
+        # model output is deterministic
+        if self.config.llm.temperature > 0:
+            Logger.warning("Semantic chunk cache disabled because temperature is above 0")
+            return
+        
+        self.semantic_cache = SemanticChunkCache(
+            threshold=extraction_config.semantic_cache_threshold,
+            path=extraction_config.semantic_cache_path,
+            signature=self._semantic_cache_signature()
+        )
+        Logger.info(f"Initialized semantic chunk cache with threshold {extraction_config.semantic_cache_threshold}")
+    
+    def _semantic_cache_signature(self) -> str:
+        """
+        Digest of the settings that decide what a chunk's result looks like:
+        extraction mode, model, prompts and ontology.
+        """
+        extraction_config = self.config.extraction
+        ontology_digest = None
+        if extraction_config.extraction_mode == "jsonld":
+            with open(extraction_config.ontology_path, "rb") as f:
+                ontology_digest = hashlib.sha256(f.read()).hexdigest()
+        return LLMCache.make_key(
+            extraction_config.extraction_mode,
+            extraction_config.enable_validation,
+            extraction_config.enable_normalization,
+            self.config.llm.provider,
+            self.llm_client.model_name,
+            self.llm_client.max_tokens,
+            self.llm_client.system_prompt,
+            self.llm_client.user_prompt_template,
+            ontology_digest
+        ).hex()
+    
+    def _initialize_result_cache(self):
+        """Initialize the in-memory cache of chunk results, if enabled."""
+        self.result_cache = None
+        cache_size = self.config.extraction.result_cache_size
+        if cache_size <= 0:
+            return
+        
+        # Sampled outputs differ between runs, so caching them would pin
+        # whichever sample came first
+        if self.config.llm.temperature > 0:
+            Logger.info("In-memory result cache disabled because temperature is above 0")
+            return
+        
+        self.result_cache = ChunkResultCache(maxsize=cache_size)
+    
     def process_text(self, text: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """
         Process text through the pipeline.
         
+        Args:
+            text: The input text to process
+            
+        Returns:
+            tuple: (success, result, error_message)
+        """
+        return self._run(self.process_text_async(text))
+    
+    async def process_text_async(self, text: str) -> Tuple[bool, Optional[Dict], Optional[str]]:
+        """
+        Process text through the pipeline, extracting chunks concurrently.
+        
+        Up to ``config.llm.get_max_concurrency()`` chunk requests are in flight at
+        once; results are collected in chunk order.
+        
         Args:
             text: The input text to process
             
@@ -116,16 +274,83 @@ class KnowledgeGraphPipeline:
             
             Logger.info(f"Created {len(chunks)} chunks for processing")
             
-            # 2. Process each chunk
+            # 2. Process the chunks concurrently. Identical chunk bodies are
+            # sent once and the result is shared by every copy. Chunks are
+            # matched by a digest of their text so no chunk text is kept.
+            chunk_keys = [chunk_key(chunk) for chunk in chunks]
+            representatives = {}
+            for key, chunk in zip(chunk_keys, chunks):
+                representatives.setdefault(key, chunk)
+            unique_chunks = list(representatives.values())
+            
+            if len(unique_chunks) < len(chunks):
+                Logger.info(f"Skipping {len(chunks) - len(unique_chunks)} duplicate chunks")
+            
+            outcome_by_number = {}
+            
+            # Reuse results for chunks this pipeline has already extracted
+            misses = list(representatives.items())
+            if self.result_cache is not None:
+                misses = []
+                for key, chunk in representatives.items():
+                    cached = self.result_cache.get(key)
+                    if cached is None:
+                        misses.append((key, chunk))
+                    else:
+                        outcome_by_number[chunk['chunk_number']] = (
+                            True, self.extractor.reassign_chunk(cached, chunk['chunk_number']), None
+                        )
+                if len(misses) < len(unique_chunks):
+                    Logger.info(f"Reused in-memory results for {len(unique_chunks) - len(misses)} chunks")
+            candidates = [chunk for _, chunk in misses]
+            
+            # Reuse results for chunks similar enough to previously seen ones
+            if self.semantic_cache is not None and candidates:
+                loop = asyncio.get_running_loop()
+                embeddings = await loop.run_in_executor(
+                    None, self.semantic_cache.embed, [chunk_text(chunk) for chunk in candidates]
+                )
+                cached_results = self.semantic_cache.lookup(embeddings)
+                pending = []
+                for chunk, embedding, cached in zip(candidates, embeddings, cached_results):
+                    if cached is None:
+                        pending.append((chunk, embedding))
+                    else:
+                        outcome_by_number[chunk['chunk_number']] = (
+                            True, self.extractor.reassign_chunk(cached, chunk['chunk_number']), None
+                        )
+                if len(pending) < len(candidates):
+                    Logger.info(f"Reused cached results for {len(candidates) - len(pending)} similar chunks")
+                to_extract = [chunk for chunk, _ in pending]
+            else:
+                to_extract = candidates
+            
+            if to_extract:
+                outcome_by_number.update(await self._extract_chunks(to_extract))
+                
+                if self.semantic_cache is not None:
+                    self._update_semantic_cache(pending, outcome_by_number)
+            
+            if self.result_cache is not None:
+                for key, chunk in misses:
+                    outcome = outcome_by_number[chunk['chunk_number']]
+                    if not isinstance(outcome, BaseException) and outcome[0]:
+                        self.result_cache.set(key, outcome[1])
+            
             all_extracted_data = []
             failed_chunks = []
             
-            for i, chunk in enumerate(chunks):
-                Logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                
-                success, data, error = self.extractor.extract_from_chunk(chunk)
+            for key, chunk in zip(chunk_keys, chunks):
+                representative = representatives[key]
+                outcome = outcome_by_number[representative['chunk_number']]
+                if isinstance(outcome, BaseException):
+                    success, data, error = False, None, f"Unexpected error: {str(outcome)}"
+                else:
+                    success, data, error = outcome
                 
                 if success:
+                    if representative is not chunk:
+                        data = self.extractor.reassign_chunk(data, chunk['chunk_number'])
                     all_extracted_data.append(data)
                 else:
                     failed_chunks.append({
@@ -135,6 +360,9 @@ class KnowledgeGraphPipeline:
             
             # 3. Process results
             result = self.extractor.process_results(all_extracted_data, failed_chunks)
+            if self.result_cache is not None:
+                # Counters cover the pipeline's lifetime, not just this call
+                result.setdefault('statistics', {})['result_cache'] = self.result_cache.stats.to_dict()
             
             Logger.info("Text processing completed successfully")
             return True, result, None
@@ -144,6 +372,109 @@ class KnowledgeGraphPipeline:
             Logger.error(error_msg)
             return False, None, error_msg
     
+    async def _extract_chunks(self, chunks: List[Dict]) -> Dict[int, object]:
+        """
+        Extract chunks with overlapping network and parsing work.
+        
+        Chunks are grouped into batches of ``config.extraction.batch_size``.
+        Producer tasks send up to ``config.llm.get_max_concurrency()`` batch
+        requests at a time and push the raw per-chunk responses onto a
+        bounded queue. Consumer
+        tasks hand each response to a thread pool for validation and
+        normalization, so parsing one chunk overlaps with waiting for the
+        next. When the parsers fall behind, the full queue holds producers
+        back.
+        
+        Args:
+            chunks: Chunks to extract
+            
+        Returns:
+            Mapping of chunk number to the (success, data, error) outcome, or
+            to the exception raised while processing it
+        """
+        loop = asyncio.get_running_loop()
+        batch_size = self.config.extraction.batch_size
+        batches = [chunks[i:i + batch_size] for i in range(0, len(chunks), batch_size)]
+        semaphore = asyncio.Semaphore(min(len(batches), self.config.llm.get_max_concurrency()))
+        parser_count = min(len(chunks), PARSER_THREADS)
+        queue = asyncio.Queue(maxsize=2 * parser_count)
+        outcome_by_number = {}
+        
+        async def produce(batch):
+            async with semaphore:
+                try:
+                    responses = await self.extractor.fetch_batch_async(batch)
+                except Exception as e:
+                    responses = [e] * len(batch)
+                for chunk, response in zip(batch, responses):
+                    await queue.put((chunk, response))
+        
+        async def consume(executor):
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                chunk, response = item
+                if isinstance(response, BaseException):
+                    outcome_by_number[chunk['chunk_number']] = response
+                    continue
+                try:
+                    outcome_by_number[chunk['chunk_number']] = await loop.run_in_executor(
+                        executor, self.extractor.handle_chunk_response, chunk, *response
+                    )
+                except Exception as e:
+                    outcome_by_number[chunk['chunk_number']] = e
+        
+        with ThreadPoolExecutor(max_workers=parser_count, thread_name_prefix="kg-parse") as executor:
+            consumers = [asyncio.create_task(consume(executor)) for _ in range(parser_count)]
+            try:
+                await asyncio.gather(*(produce(batch) for batch in batches))
+                for _ in consumers:
+                    await queue.put(None)
+                await asyncio.gather(*consumers)
+            finally:
+                for consumer in consumers:
+                    consumer.cancel()
+        
+        return outcome_by_number
+    
+    def _update_semantic_cache(self, pending: List[Tuple[Dict, object]], outcome_by_number: Dict) -> None:
+        """Add successful extractions to the semantic chunk cache."""
+        embeddings = []
+        results = []
+        for chunk, embedding in pending:
+            outcome = outcome_by_number[chunk['chunk_number']]
+            if not isinstance(outcome, BaseException) and outcome[0]:
+                embeddings.append(embedding)
+                results.append(outcome[1])
+        if results:
+            self.semantic_cache.add(embeddings, results)
+            self.semantic_cache.save()
+    
+    async def aclose(self) -> None:
+        """Close the pipeline's HTTP connections."""
+        await self.http_client.aclose()
+    
+    def close(self) -> None:
+        """Close the pipeline's HTTP connections and its event loop."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.aclose())
+            self._loop.close()
+        else:
+            asyncio.run(self.aclose())
+    
+    async def __aenter__(self) -> 'KnowledgeGraphPipeline':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    def _run(self, coroutine):
+        """Run a coroutine to completion on the pipeline's event loop."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+    
     def process_pdf(self, pdf_path: Union[str, Path], pages: Optional[List[int]] = None) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """
         Process a PDF file through the pipeline.
@@ -169,14 +500,15 @@ class KnowledgeGraphPipeline:
             Logger.error(error_msg)
             return False, None, error_msg
     
-    def display_results(self, result: Dict) -> None:
+    def display_results(self, result: Dict, max_rows: Optional[int] = DEFAULT_MAX_ROWS) -> None:
         """
         Display the processing results.
         
         Args:
             result: The result dictionary from process_text
+            max_rows: Maximum number of triples to print, or None for all
         """
-        DisplayManager.display_results(result, self.config.extraction.extraction_mode)
+        DisplayManager.display_results(result, self.config.extraction.extraction_mode, max_rows)
     
     def display_summary(self, result: Dict) -> None:
         """
@@ -1,16 +1,33 @@
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-import json
-from owlready2 import *
+from typing import Dict, List, Optional, Tuple, Union
+import hashlib
+import msgspec
 from pyld import jsonld
+from src.utils.jsonld_utils import combine_jsonld
+from src.utils.logger import Logger
+
+
+class _TermIRIs(dict):
+    """Term-to-IRI mapping that gives back any term it doesn't know unchanged."""
+
+    def __missing__(self, term: str) -> str:
+        return term
+
 
 class OntologyProcessor:
-    def __init__(self, ontology_path: Union[str, Path]):
+    def __init__(self, ontology_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None):
         """
         Initialize the ontology processor with a local OWL file.
         
+        The ontology is only loaded, and its JSON-LD context built, when
+        first needed (see preload).
+        
         Args:
             ontology_path (Union[str, Path]): Path to the local OWL file
+            cache_dir (Optional[Union[str, Path]]): Directory where parsed
+                ontologies are kept as owlready2 SQLite quadstores, keyed by
+                the OWL file's content, or None to parse on every load
         """
         if not isinstance(ontology_path, Path):
             ontology_path = Path(ontology_path)
@@ -21,15 +38,112 @@ class OntologyProcessor:
         if ontology_path.suffix.lower() != '.owl':
             raise ValueError(f"Expected .owl file, got {ontology_path.suffix}")
             
-        # Load the ontology
-        self.ontology = get_ontology(str(ontology_path)).load()
+        self._path = ontology_path
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._world = None
+        self._document_loader = jsonld.get_document_loader()
+        self._remote_documents: Dict[str, Dict] = {}
+        self._jsonld_options = {"documentLoader": self._load_document}
+        
+    @cached_property
+    def ontology(self):
+        """The owlready2 ontology, loaded on first access."""
+        import owlready2
+        if self.cache_dir is None:
+            return owlready2.get_ontology(str(self._path)).load()
+        
+        with open(self._path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        db_file = self.cache_dir / f"onto_{digest}.sqlite3"
+        # Written after the quadstore is saved, so its presence marks a complete entry
+        iri_file = self.cache_dir / f"onto_{digest}.iri"
+        
+        if iri_file.exists():
+            try:
+                self._world = owlready2.World(filename=str(db_file))
+                ontology = self._world.get_ontology(iri_file.read_text(encoding='utf-8'))
+                Logger.debug(f"Loaded ontology {ontology.base_iri} from {db_file}")
+                return ontology
+            except Exception as e:
+                Logger.warning(f"Ignoring unreadable ontology cache {db_file}: {e}")
+                self._world = None
+        
+        # Parse the OWL file into a fresh quadstore and keep it for next time
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        iri_file.unlink(missing_ok=True)
+        db_file.unlink(missing_ok=True)
+        self._world = owlready2.World(filename=str(db_file))
+        ontology = self._world.get_ontology(str(self._path)).load()
+        self._world.save()
+        iri_file.write_text(ontology.base_iri, encoding='utf-8')
+        return ontology
+        
+    @cached_property
+    def _classes(self) -> tuple:
+        """The ontology's classes, queried once."""
+        return tuple(self.ontology.classes())
+        
+    @cached_property
+    def _object_properties(self) -> tuple:
+        """The ontology's object properties, queried once."""
+        return tuple(self.ontology.object_properties())
+        
+    @cached_property
+    def _data_properties(self) -> tuple:
+        """The ontology's data properties, queried once."""
+        return tuple(self.ontology.data_properties())
+        
+    @cached_property
+    def owl_content(self) -> str:
+        """The raw OWL content, read on first access."""
+        with open(self._path, 'r', encoding='utf-8') as f:
+            return f.read()
+        
+    @cached_property
+    def context(self) -> Dict:
+        """
+        The JSON-LD context, built on first access. It is shared with every
+        caller and chunk, so it must not be modified.
+        """
+        return self._build_jsonld_context()
+        
+    @cached_property
+    def context_url(self) -> str:
+        """
+        URL the context is served under by this processor's document loader.
+        
+        pyld resolves a dict context by canonicalizing all of it on every
+        expand/compact call to find it in its cache. Referring to the context
+        by URL instead makes that a plain lookup after the first resolution.
+        """
+        digest = hashlib.sha256(msgspec.json.encode(self.context, order="sorted")).hexdigest()
+        return f"urn:kg-extraction:context:{digest}"
+        
+    @cached_property
+    def _valid_iris(self) -> frozenset:
+        """IRIs of all ontology terms, used by validate_jsonld for every chunk."""
+        return frozenset(
+            info["@id"] for info in self.context["@context"].values()
+            if isinstance(info, dict) and "@id" in info
+        )
         
-        # Store the raw OWL content
-        with open(ontology_path, 'r', encoding='utf-8') as f:
-            self.owl_content = f.read()
+    @cached_property
+    def _term_to_iri(self) -> _TermIRIs:
+        """IRI of every compacted term in the context, looked up by _get_term_iri."""
+        return _TermIRIs(
+            (term, info["@id"]) for term, info in self.context["@context"].items()
+            if not term.startswith(('@', 'http://', 'https://'))
+        )
         
-        # Build JSON-LD context
-        self.context = self._build_jsonld_context()
+    def preload(self) -> None:
+        """
+        Load the ontology and build everything derived from it now rather
+        than on first use, e.g. before validating chunks from several threads.
+        """
+        self.owl_content
+        self._valid_iris
+        self._term_to_iri
+        self.context_url
         
     def _build_jsonld_context(self) -> Dict:
         """
@@ -43,33 +157,75 @@ class OntologyProcessor:
                 **{cls.name: {
                     "@id": str(cls.iri),
                     "@type": "@id"
-                } for cls in self.ontology.classes()},
+                } for cls in self._classes},
                 # Add all object properties
                 **{prop.name: {
                     "@id": str(prop.iri),
                     "@type": "@id"
-                } for prop in self.ontology.object_properties()},
+                } for prop in self._object_properties},
                 # Add all data properties
                 **{prop.name: {
                     "@id": str(prop.iri)
-                } for prop in self.ontology.data_properties()}
+                } for prop in self._data_properties}
             }
         }
         return context
         
     def get_context(self) -> Dict:
-        """Get the JSON-LD context for the ontology."""
+        """Get the JSON-LD context for the ontology (the same object on every call)."""
         return self.context
         
+    def _load_document(self, url: str, options: Dict) -> Dict:
+        """
+        pyld document loader serving the ontology context from memory.
+        
+        Other documents (e.g. remote contexts an LLM response refers to) are
+        fetched once and kept, as pyld only caches them per operation.
+        """
+        if url == self.context_url:
+            return {
+                "contentType": "application/ld+json",
+                "contextUrl": None,
+                "documentUrl": url,
+                "document": self.context,
+                "tag": "static"
+            }
+        remote_doc = self._remote_documents.get(url)
+        if remote_doc is None:
+            remote_doc = self._remote_documents[url] = self._document_loader(url, options)
+        # pyld updates the returned document in place
+        return dict(remote_doc)
+        
+    def _by_context_url(self, jsonld_data: Dict) -> Dict:
+        """Refer to the ontology context by URL if the data embeds it."""
+        if isinstance(jsonld_data, dict) and jsonld_data.get("@context") is self.context["@context"]:
+            return {**jsonld_data, "@context": self.context_url}
+        return jsonld_data
+        
+    def compact_jsonld(self, expanded: Union[Dict, List], options: Optional[Dict] = None) -> Dict:
+        """
+        Compact expanded JSON-LD against the ontology context.
+        
+        Args:
+            expanded: Expanded JSON-LD
+            options: Extra pyld compaction options
+            
+        Returns:
+            Dict: Compacted JSON-LD with the ontology context embedded
+        """
+        compacted = jsonld.compact(expanded, self.context_url, {**self._jsonld_options, **(options or {})})
+        compacted["@context"] = self.context["@context"]
+        return compacted
+        
     def get_ontology_info(self) -> Dict:
         """
         Get basic information about the ontology structure.
         Useful for LLM prompts and validation.
         """
         return {
-            "classes": [cls.name for cls in self.ontology.classes()],
-            "object_properties": [prop.name for prop in self.ontology.object_properties()],
-            "data_properties": [prop.name for prop in self.ontology.data_properties()],
+            "classes": [cls.name for cls in self._classes],
+            "object_properties": [prop.name for prop in self._object_properties],
+            "data_properties": [prop.name for prop in self._data_properties],
             "base_iri": str(self.ontology.base_iri)
         }
         
@@ -83,19 +239,74 @@ class OntologyProcessor:
         Returns:
             str: The full IRI for the term
         """
-        if term.startswith('@'):
-            return term
-            
-        # If it's already an IRI, return it
-        if term.startswith('http://') or term.startswith('https://'):
-            return term
-            
-        # If it's a compacted term, get its IRI from context
-        if term in self.context["@context"]:
-            return self.context["@context"][term]["@id"]
+        return self._term_to_iri[term]
+
+    def _check_terms(self, expanded) -> bool:
+        """
+        Check that every term in expanded JSON-LD is defined by the ontology.
+        
+        Walks the document with an explicit stack and stops at the first
+        invalid term; its location is only worked out for the warning.
+        
+        Args:
+            expanded: Expanded JSON-LD value
             
-        return term
+        Returns:
+            bool: True if all terms are valid
+        """
+        terms = self.context["@context"]
+        valid_iris = self._valid_iris
+        stack = [expanded]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                for key, value in obj.items():
+                    if key.startswith('@'):
+                        continue
+                        
+                    # Expanded keys are normally full IRIs of ontology terms, so
+                    # check that first; otherwise accept a compacted term or
+                    # anything that maps to a valid IRI
+                    if key not in valid_iris and key not in terms:
+                        term_iri = self._get_term_iri(key)
+                        if term_iri not in valid_iris:
+                            path = _path_to(expanded, obj)
+                            Logger.warning(f"Invalid term '{key}' (IRI: {term_iri}) at path '{path}'")
+                            if Logger.is_debug_enabled():
+                                Logger.debug(f"Available terms: {list(terms.keys())}")
+                                Logger.debug(f"Available IRIs: {sorted(valid_iris)}")
+                            return False
+                        
+                    if isinstance(value, (dict, list)):
+                        stack.append(value)
+            elif isinstance(obj, list):
+                stack.extend(obj)
+        return True
 
+    def combine_jsonld(self, docs: List[Dict]) -> Dict:
+        """
+        Combine JSON-LD documents into one document with a shared @graph.
+        
+        The documents' own @context entries are dropped, so they must have
+        been written against the ontology context (as normalize_jsonld's
+        output is). Lets a batch be expanded, compacted or uploaded once
+        instead of once per document.
+        
+        Args:
+            docs (List[Dict]): JSON-LD documents, with or without an @graph
+            
+        Returns:
+            Dict: A single document using the ontology context
+        """
+        return combine_jsonld(docs, self.context["@context"])
+        
+    def _expand(self, jsonld_data: Dict) -> List:
+        """Expand JSON-LD data, with the ontology context as the default context."""
+        return jsonld.expand(
+            self._by_context_url(jsonld_data),
+            {**self._jsonld_options, "expandContext": self.context_url}
+        )
+        
     def validate_jsonld(self, jsonld_data: Union[str, Dict]) -> bool:
         """
         Validate JSON-LD data against the ontology.
@@ -103,56 +314,23 @@ class OntologyProcessor:
         """
         try:
             if isinstance(jsonld_data, str):
-                jsonld_data = json.loads(jsonld_data)
+                jsonld_data = msgspec.json.decode(jsonld_data)
                 
             # Expand the JSON-LD to check for valid terms
             try:
-                expanded = jsonld.expand(jsonld_data, {"expandContext": self.context})
+                expanded = self._expand(jsonld_data)
              
             except Exception as e:
-                print(f"\nJSON-LD expansion error: {str(e)}")
+                Logger.warning(f"JSON-LD expansion error: {str(e)}")
                 return False
             
-            # Get all valid IRIs from the context
-            valid_iris = set()
-            for term, info in self.context["@context"].items():
-                if isinstance(info, dict) and "@id" in info:
-                    valid_iris.add(info["@id"])
-            
-            # Basic validation - check if all terms are in the context
-            def check_terms(obj, path=""):
-                if isinstance(obj, dict):
-                    for key in obj:
-                        if key.startswith('@'):
-                            continue
-                            
-                        # Get the full IRI for this term
-                        term_iri = self._get_term_iri(key)
-                        
-                        # Check if either the compacted term or its IRI is valid
-                        if (key not in self.context["@context"] and 
-                            term_iri not in valid_iris):
-                            print(f"\nInvalid term '{key}' (IRI: {term_iri}) at path '{path}'")
-                            print(f"Available terms: {list(self.context['@context'].keys())}")
-                            print(f"Available IRIs: {sorted(list(valid_iris))}")
-                            return False
-                            
-                        if isinstance(obj[key], (dict, list)):
-                            if not check_terms(obj[key], f"{path}.{key}"):
-                                return False
-                elif isinstance(obj, list):
-                    for i, item in enumerate(obj):
-                        if not check_terms(item, f"{path}[{i}]"):
-                            return False
-                return True
-                
-            is_valid = check_terms(expanded)
+            is_valid = self._check_terms(expanded)
             if not is_valid:
-                print("\nJSON-LD validation failed")
+                Logger.warning("JSON-LD validation failed")
             return is_valid
             
         except Exception as e:
-            print(f"\nJSON-LD validation error: {str(e)}")
+            Logger.warning(f"JSON-LD validation error: {str(e)}")
             return False
             
     def normalize_jsonld(self, jsonld_data: Union[str, Dict]) -> Optional[Dict]:
@@ -162,20 +340,76 @@ class OntologyProcessor:
         """
         try:
             if isinstance(jsonld_data, str):
-                jsonld_data = json.loads(jsonld_data)
+                jsonld_data = msgspec.json.decode(jsonld_data)
                 
             # Expand the JSON-LD
-            expanded = jsonld.expand(jsonld_data, {"expandContext": self.context})
+            expanded = self._expand(jsonld_data)
             
             # Compact it back using our context
-            compacted = jsonld.compact(expanded, self.context)
-            
-            return compacted
+            return self.compact_jsonld(expanded)
             
         except Exception as e:
-            print(f"JSON-LD normalization error: {str(e)}")
+            Logger.warning(f"JSON-LD normalization error: {str(e)}")
             return None
 
+    def validate_and_normalize_jsonld(self, jsonld_data: Union[str, Dict]) -> Tuple[bool, Optional[Dict]]:
+        """
+        Validate and normalize JSON-LD data with a single expansion.
+        
+        Equivalent to validate_jsonld followed by normalize_jsonld, but the
+        expanded form used to check the terms is compacted directly instead
+        of being computed a second time.
+        
+        Returns:
+            Tuple[bool, Optional[Dict]]: Whether the data is valid, and the
+            normalized data (None if invalid or normalization failed)
+        """
+        if isinstance(jsonld_data, str):
+            try:
+                jsonld_data = msgspec.json.decode(jsonld_data)
+            except Exception as e:
+                Logger.warning(f"JSON-LD validation error: {str(e)}")
+                return False, None
+            
+        try:
+            expanded = self._expand(jsonld_data)
+        except Exception as e:
+            Logger.warning(f"JSON-LD expansion error: {str(e)}")
+            return False, None
+        
+        try:
+            is_valid = self._check_terms(expanded)
+        except Exception as e:
+            Logger.warning(f"JSON-LD validation error: {str(e)}")
+            return False, None
+        if not is_valid:
+            Logger.warning("JSON-LD validation failed")
+            return False, None
+        
+        try:
+            return True, self.compact_jsonld(expanded)
+        except Exception as e:
+            Logger.warning(f"JSON-LD normalization error: {str(e)}")
+            return True, None
+
     def get_owl_content(self) -> str:
         """Return the raw OWL ontology as a string."""
-        return self.owl_content 
\ No newline at end of file
+        return self.owl_content
+
+
+def _path_to(obj, target, path: str = "") -> Optional[str]:
+    """Location of target within a JSON-LD value (as _check_terms walks it), for messages."""
+    if obj is target:
+        return path
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not key.startswith('@') and isinstance(value, (dict, list)):
+                found = _path_to(value, target, f"{path}.{key}")
+                if found is not None:
+                    return found
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            found = _path_to(item, target, f"{path}[{i}]")
+            if found is not None:
+                return found
+    return None
@@ -1,15 +1,114 @@
+import gzip
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
 import pymupdf4llm
 from pathlib import Path
 from typing import Union, Optional, List, Dict
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional; deduplication falls back to a per-triple loop
+    pa = None
+
+# Lookup table of the code points str.split() treats as whitespace (all of
+# them are below U+3001); the last entry stands for every higher code point
+_WHITESPACE_LIMIT = 0x3001
+_IS_WHITESPACE = np.zeros(_WHITESPACE_LIMIT + 1, dtype=bool)
+_IS_WHITESPACE[[c for c in range(_WHITESPACE_LIMIT) if chr(c).isspace()]] = True
+
+# Fewest pages each worker gets when a PDF is extracted in parallel
+MIN_PAGES_PER_WORKER = 4
+
+# Characters scanned per block when looking for word boundaries, which
+# bounds the scan's working memory independently of the text size
+SCAN_BLOCK_CHARS = 1 << 20
+
+# RE2 pattern matching the characters str.split() treats as whitespace
+_ARROW_WHITESPACE = r"[\s\x0b\x1c-\x1f\x85\p{Z}]+"
+
+# Below this many triples the per-triple loop beats the columnar path,
+# whose fixed cost (array conversion, regex setup) is roughly 0.5ms
+COLUMNAR_DEDUP_MIN_TRIPLES = 2048
+
+
+def _all_ascii(triples: List[Dict]) -> bool:
+    """Whether every subject, predicate and object is an ASCII string."""
+    return all(
+        isinstance(value, str) and value.isascii()
+        for triple in triples
+        for value in (triple.get('subject', ''), triple.get('predicate', ''), triple.get('object', ''))
+    )
+
+
+def chunk_text(chunk: Dict) -> str:
+    """
+    Materialize the text of a chunk.
+    
+    Chunks from split_into_chunks only reference their span of the source
+    text; the words in the span are joined with single spaces.
+    
+    Args:
+        chunk: Chunk dictionary, either with a 'text' entry or a
+            'source'/'start'/'end' span
+        
+    Returns:
+        str: The chunk text
+    """
+    text = chunk.get("text")
+    if text is not None:
+        return text
+    return " ".join(chunk["source"][chunk["start"]:chunk["end"]].split())
+
+
+class Chunk(dict):
+    """
+    Chunk dictionary returned by split_into_chunks.
+    
+    Holds 'chunk_number', 'source', 'start' and 'end'. The 'text' key that
+    chunks used to carry can still be read as chunk['text']; it is built by
+    chunk_text on every access rather than stored.
+    """
+    
+    def __missing__(self, key):
+        if key == "text":
+            return chunk_text(self)
+        raise KeyError(key)
+
+
+def _pdf_to_markdown(pdf_path: str, pages: Optional[list]) -> str:
+    """Extract pages of a PDF as markdown (module level, so worker processes can run it)."""
+    return pymupdf4llm.to_markdown(pdf_path, pages=pages)
+
+
+def chunk_key(chunk: Dict) -> bytes:
+    """
+    Compact digest identifying a chunk's text, for detecting duplicates.
+    
+    Args:
+        chunk: Chunk dictionary
+        
+    Returns:
+        bytes: 16-byte BLAKE2b digest of the chunk text
+    """
+    return hashlib.blake2b(chunk_text(chunk).encode("utf-8"), digest_size=16).digest()
+
+
 class TextProcessor:
-    def __init__(self, chunk_size=2000, overlap=100):
+    def __init__(self, chunk_size=2000, overlap=100, cache_dir: Optional[Union[str, Path]] = None, n_workers: int = 1):
         """
         Initialize the text processor with chunking parameters.
         
         Args:
             chunk_size (int): Maximum number of words per chunk
             overlap (int): Number of words to overlap between chunks
+            cache_dir (Optional[Union[str, Path]]): Directory where extracted
+                PDF text is cached, or None to extract on every call
+            n_workers (int): Processes used to extract the pages of a PDF
         """
         if chunk_size <= 0:
             raise ValueError("Chunk size must be positive")
@@ -17,14 +116,23 @@ class TextProcessor:
             raise ValueError("Overlap cannot be negative")
         if overlap >= chunk_size:
             raise ValueError(f"Overlap ({overlap}) must be smaller than chunk size ({chunk_size})")
+        if n_workers < 1:
+            raise ValueError(f"Number of workers must be at least 1, got {n_workers}")
             
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self._stride = chunk_size - overlap
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.n_workers = n_workers
 
     def extract_text_from_pdf(self, pdf_path: Union[str, Path], pages: Optional[list] = None) -> str:
         """
         Extract text from a PDF file using PyMuPDF4LLM.
         
+        With a cache_dir, the markdown is stored gzipped under a key of the
+        file's path, modification time, size and the requested pages, so
+        extracting the same unchanged file again only reads the cache.
+        
         Args:
             pdf_path (Union[str, Path]): Path to the PDF file
             pages (Optional[list]): List of page numbers to extract (0-based). If None, extracts all pages.
@@ -32,12 +140,63 @@ class TextProcessor:
         Returns:
             str: Extracted text in markdown format
         """
+        cache_file = self._pdf_cache_file(pdf_path, pages) if self.cache_dir is not None else None
+        if cache_file is not None and cache_file.exists():
+            try:
+                with gzip.open(cache_file, 'rt', encoding='utf-8') as f:
+                    return f.read()
+            except (OSError, EOFError):
+                pass  # unreadable entry, extract again
+        
         try:
             # Convert to markdown format which preserves document structure
-            markdown_text = pymupdf4llm.to_markdown(str(pdf_path), pages=pages)
-            return markdown_text
+            markdown_text = self._pdf_to_markdown(str(pdf_path), pages)
         except Exception as e:
             raise ValueError(f"Error extracting text from PDF: {str(e)}")
+        
+        if cache_file is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with gzip.open(temp_file, 'wt', encoding='utf-8', compresslevel=3) as f:
+                f.write(markdown_text)
+            os.replace(temp_file, cache_file)
+        return markdown_text
+    
+    def _pdf_to_markdown(self, pdf_path: str, pages: Optional[list]) -> str:
+        """
+        Run pymupdf4llm over the requested pages, split across n_workers
+        processes when there are enough pages.
+        
+        Each worker converts a contiguous range of pages and the results are
+        joined in page order. pymupdf4llm derives heading levels from the
+        font sizes of the pages it is given, so these can differ slightly
+        from a single-process extraction.
+        """
+        if self.n_workers > 1:
+            if pages is None:
+                import pymupdf
+                with pymupdf.open(pdf_path) as doc:
+                    pages = list(range(doc.page_count))
+            pages = list(pages)
+            n_groups = min(self.n_workers, len(pages) // MIN_PAGES_PER_WORKER)
+            if n_groups > 1:
+                size, extra = divmod(len(pages), n_groups)
+                bounds = [i * size + min(i, extra) for i in range(n_groups + 1)]
+                groups = [pages[bounds[i]:bounds[i + 1]] for i in range(n_groups)]
+                with ProcessPoolExecutor(max_workers=n_groups) as executor:
+                    return "".join(executor.map(_pdf_to_markdown, repeat(pdf_path), groups))
+        return _pdf_to_markdown(pdf_path, pages)
+    
+    def _pdf_cache_file(self, pdf_path: Union[str, Path], pages: Optional[list]) -> Optional[Path]:
+        """Cache file for a PDF extraction, or None if the file can't be found."""
+        try:
+            path = Path(pdf_path).resolve()
+            stat = path.stat()
+        except OSError:
+            return None  # let pymupdf4llm report the error
+        key = f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0{list(pages) if pages is not None else None}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.md.gz"
 
     def process_text(self, text: str) -> List[Dict[str, Union[str, int]]]:
         """
@@ -47,7 +206,7 @@ class TextProcessor:
             text (str): The text to process
             
         Returns:
-            List[Dict[str, Union[str, int]]]: List of dictionaries containing chunk text and chunk number
+            List[Dict[str, Union[str, int]]]: List of chunk dictionaries (see split_into_chunks)
         """
         return self.split_into_chunks(text)
 
@@ -60,7 +219,7 @@ class TextProcessor:
             pages (Optional[list]): List of page numbers to extract (0-based). If None, extracts all pages.
             
         Returns:
-            List[Dict[str, Union[str, int]]]: List of dictionaries containing chunk text and chunk number
+            List[Dict[str, Union[str, int]]]: List of chunk dictionaries (see split_into_chunks)
         """
         text = self.extract_text_from_pdf(pdf_path, pages=pages)
         return self.process_text(text)
@@ -69,43 +228,69 @@ class TextProcessor:
         """
         Split text into overlapping chunks.
         
+        Chunks don't copy the text: each one records the character span
+        [start, end) of its words in the shared source string, and the text
+        is only built (see chunk_text) when a prompt needs it.
+        
         Args:
             text (str): The text to split
             
         Returns:
-            list: List of dictionaries containing chunk text and chunk number
-        """
-        words = text.split()
-        total_words = len(words)
-        chunks = []
-        start_index = 0
-        chunk_number = 1
-        
-        while start_index < total_words:
-            end_index = min(start_index + self.chunk_size, total_words)
-            chunk_text = " ".join(words[start_index:end_index])
-            chunks.append({
-                "text": chunk_text,
-                "chunk_number": chunk_number
-            })
+            list: List of Chunk dictionaries containing the chunk number,
+            the source text and the chunk's start and end offsets
+        """
+        step = self._stride
+        last_word = self.chunk_size - 1
+        starts = []
+        ends = []
+        word_count = 0  # words started so far
+        end_count = 0  # words ended so far
+        text_end = 0
+        in_word = False
+        
+        # Word boundaries in a few array operations per block: one code point
+        # per element, so offsets index the str directly. Only the offsets
+        # where a chunk starts (word i * step) or ends (word i * step +
+        # chunk_size - 1) are kept.
+        for offset in range(0, len(text), SCAN_BLOCK_CHARS):
+            block = text[offset:offset + SCAN_BLOCK_CHARS]
+            codes = np.frombuffer(block.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+            is_word = ~_IS_WHITESPACE[np.minimum(codes, _WHITESPACE_LIMIT)]
+            edges = np.flatnonzero(np.diff(is_word, prepend=in_word))
+            word_starts = edges[is_word[edges]] + offset
+            word_ends = edges[~is_word[edges]] + offset
             
-            # Calculate the start of the next chunk
-            next_start_index = start_index + self.chunk_size - self.overlap
+            starts.extend(word_starts[-word_count % step::step].tolist())
+            first_end = last_word - end_count if end_count <= last_word else (last_word - end_count) % step
+            ends.extend(word_ends[first_end::step].tolist())
             
-            # Ensure progress is made
-            if next_start_index <= start_index:
-                if end_index == total_words:
-                    break
-                next_start_index = start_index + 1
-                
-            start_index = next_start_index
-            chunk_number += 1
-            
-            # Safety break
-            if chunk_number > total_words:
-                break
-                
-        return chunks
+            word_count += len(word_starts)
+            end_count += len(word_ends)
+            if len(word_ends):
+                text_end = int(word_ends[-1])
+            in_word = bool(is_word[-1])
+        
+        if word_count == 0:
+            return []
+        
+        # A word running to the end of the text ends there
+        if in_word:
+            if end_count >= last_word and (end_count - last_word) % step == 0:
+                ends.append(len(text))
+            text_end = len(text)
+        
+        # Chunks running into the end of the text close at the last word
+        ends.extend([text_end] * (len(starts) - len(ends)))
+        
+        return [
+            Chunk(
+                chunk_number=chunk_number,
+                source=text,
+                start=start,
+                end=end
+            )
+            for chunk_number, (start, end) in enumerate(zip(starts, ends), start=1)
+        ]
 
     def normalize_triple(self, triple):
         """
@@ -130,10 +315,12 @@ class TextProcessor:
         if not all([subject, predicate, object_]):
             return None
             
+        # Entity and relation names repeat across many triples; interning
+        # keeps one copy of each
         return {
-            'subject': subject,
-            'predicate': predicate,
-            'object': object_,
+            'subject': sys.intern(subject),
+            'predicate': sys.intern(predicate),
+            'object': sys.intern(object_),
             'source_chunk': triple.get('chunk', 'unknown')
         }
 
@@ -142,20 +329,96 @@ class TextProcessor:
         Remove duplicate triples while preserving source chunk information.
         
         Args:
-            triples (list): List of triple dictionaries
+            triples (iterable): Triple dictionaries; any iterable, such as a
+                generator, is consumed in a single pass
             
         Returns:
             list: List of unique triples
         """
-        seen_triples = set()
-        unique_triples = []
+        if (pa is not None and isinstance(triples, list) and len(triples) >= COLUMNAR_DEDUP_MIN_TRIPLES
+                and _all_ascii(triples)):
+            return self._deduplicate_triples_columnar(triples)
         
+        # Same normalization as normalize_triple, inlined so that a duplicate
+        # costs a key lookup and no result dict; the first occurrence wins
+        unique_triples = {}
         for triple in triples:
-            normalized = self.normalize_triple(triple)
-            if normalized:
-                triple_key = (normalized['subject'], normalized['predicate'], normalized['object'])
-                if triple_key not in seen_triples:
-                    seen_triples.add(triple_key)
-                    unique_triples.append(normalized)
-                    
-        return unique_triples 
\ No newline at end of file
+            if 'subject' not in triple or 'predicate' not in triple or 'object' not in triple:
+                continue
+            subject = triple['subject'].strip().lower()
+            predicate = ' '.join(triple['predicate'].lower().split())
+            object_ = triple['object'].strip().lower()
+            if not (subject and predicate and object_):
+                continue
+            
+            # Interned, as in normalize_triple
+            triple_key = (sys.intern(subject), sys.intern(predicate), sys.intern(object_))
+            if triple_key not in unique_triples:
+                unique_triples[triple_key] = {
+                    'subject': triple_key[0],
+                    'predicate': triple_key[1],
+                    'object': triple_key[2],
+                    'source_chunk': triple.get('chunk', 'unknown')
+                }
+                
+        return list(unique_triples.values())
+
+    def _deduplicate_triples_columnar(self, triples):
+        """
+        Vectorized deduplicate_triples using pyarrow compute kernels.
+        
+        Normalization, filtering and deduplication run over whole columns
+        instead of per-triple dicts, keeping the first occurrence of each
+        triple and its source chunk. The result is identical for ASCII text
+        only: pyarrow's Unicode case mapping and whitespace differ from
+        str.lower() and str.strip() (e.g. "İ" lowers differently), so
+        deduplicate_triples doesn't use this path for other input.
+        
+        Args:
+            triples (list): List of triple dictionaries
+            
+        Returns:
+            list: List of unique triples
+        """
+        rows = [t for t in triples if 'subject' in t and 'predicate' in t and 'object' in t]
+        if not rows:
+            return []
+        
+        def normalize(values):
+            return pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(values, type=pa.string())))
+        
+        subject = normalize([t['subject'] for t in rows])
+        predicate = pc.replace_substring_regex(
+            normalize([t['predicate'] for t in rows]), pattern=_ARROW_WHITESPACE, replacement=" "
+        )
+        object_ = normalize([t['object'] for t in rows])
+        
+        # Row of the first occurrence of each distinct triple, grouped on
+        # the three columns themselves so no separator can make two
+        # different triples collide; sorted back into input order
+        unique = pa.table({
+            'subject': subject,
+            'predicate': predicate,
+            'object': object_,
+            'row': pa.array(range(len(rows)), type=pa.int64())
+        }).group_by(['subject', 'predicate', 'object'], use_threads=False).aggregate([('row', 'min')])
+        unique = unique.sort_by('row_min')
+        unique = unique.filter(pc.and_(
+            pc.and_(pc.greater(pc.utf8_length(unique['subject']), 0), pc.greater(pc.utf8_length(unique['predicate']), 0)),
+            pc.greater(pc.utf8_length(unique['object']), 0)
+        ))
+        
+        return [
+            {
+                'subject': sys.intern(subject_value),
+                'predicate': sys.intern(predicate_value),
+                'object': sys.intern(object_value),
+                'source_chunk': rows[row].get('chunk', 'unknown')
+            }
+            for subject_value, predicate_value, object_value, row in zip(
+                unique['subject'].to_pylist(),
+                unique['predicate'].to_pylist(),
+                unique['object'].to_pylist(),
+                unique['row_min'].to_pylist()
+            )
+        ]
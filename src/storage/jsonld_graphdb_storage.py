@@ -1,6 +1,68 @@
-import requests
-import json
-from typing import Union, Optional
+import httpx
+import msgspec
+from typing import Dict, Iterator, List, Tuple, Union, Optional
+from src.models.retry import api_retry
+from src.utils.jsonld_utils import combine_jsonld
+from src.utils.logger import Logger
+
+# Connections kept open per GraphDB host
+POOL_MAXSIZE = 32
+
+# Large uploads can take a while for GraphDB to commit
+UPLOAD_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+# Connection attempts retried by the transport before a request fails
+CONNECT_RETRIES = 3
+
+# Uploads add statements, so they are only retried when GraphDB can't have
+# received them: the connection was never made, or it refused the request
+# (429/503). Read timeouts and gateway errors (502/504) aren't retried, as
+# the first upload may still have been stored.
+RETRYABLE_STATUS_CODES = (429, 503)
+RETRYABLE_UPLOAD_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.HTTPStatusError)
+
+# Retry budget of an upload, much smaller than that of LLM requests
+UPLOAD_MAX_ATTEMPTS = 3
+UPLOAD_MAX_WAIT_SECONDS = 10.0
+UPLOAD_RETRY_SECONDS = 60.0
+
+# Graphs with at least this many nodes are encoded and sent piece by piece
+# (chunked transfer) rather than as one bytes object held in memory
+STREAM_MIN_NODES = 10000
+
+# Approximate size of each streamed piece of the request body
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def iter_encoded_chunks(jsonld_data: Dict, sizes: Optional[List[int]] = None) -> Iterator[bytes]:
+    """
+    Encode a JSON-LD document with an @graph as JSON, a few nodes at a time.
+    
+    Args:
+        jsonld_data: Document to encode
+        sizes: If given, the size of every yielded piece is appended to it
+        
+    Yields:
+        Pieces of about STREAM_CHUNK_BYTES of the encoded document
+    """
+    encoder = msgspec.json.Encoder()
+    head = {key: value for key, value in jsonld_data.items() if key != "@graph"}
+    buffer = bytearray(encoder.encode(head)[:-1])
+    buffer += b',"@graph":[' if head else b'"@graph":['
+    for i, node in enumerate(jsonld_data["@graph"]):
+        if i:
+            buffer += b","
+        encoder.encode_into(node, buffer, -1)
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            if sizes is not None:
+                sizes.append(len(buffer))
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]}"
+    if sizes is not None:
+        sizes.append(len(buffer))
+    yield bytes(buffer)
+
 
 class JSONLDGraphDBStorage:
     def __init__(self, repo_id: str, base_url: str = "http://localhost:7200"):
@@ -13,18 +75,36 @@ class JSONLDGraphDBStorage:
         self.repo_id = repo_id
         self.base_url = base_url.rstrip("/")
         self.endpoint = f"{self.base_url}/repositories/{self.repo_id}/statements"
+        # Keep-alive connections reused by every upload; HTTP/2 (over TLS)
+        # multiplexes concurrent uploads on one connection
+        self._client = httpx.Client(
+            timeout=UPLOAD_TIMEOUT,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=CONNECT_RETRIES,
+                limits=httpx.Limits(max_connections=POOL_MAXSIZE, max_keepalive_connections=POOL_MAXSIZE)
+            )
+        )
 
-    def upload_jsonld(self, jsonld_data: Union[dict, str], context: Optional[str] = None) -> bool:
+    def __enter__(self) -> 'JSONLDGraphDBStorage':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def upload_jsonld(self, jsonld_data: Union[dict, list, str], context: Optional[str] = None) -> bool:
         """
         Upload JSON-LD data to the GraphDB repository.
         Args:
-            jsonld_data (Union[dict, str]): The JSON-LD data to upload.
+            jsonld_data (Union[dict, list, str]): The JSON-LD data to upload. A list of
+                documents is combined and sent in a single request.
             context (Optional[str]): Optional named graph context (as a full IRI, e.g. '<http://example.org/graph>').
         Returns:
             bool: True if upload succeeded, False otherwise.
         """
         headers = {"Content-Type": "application/ld+json"}
-        data = json.dumps(jsonld_data) if isinstance(jsonld_data, dict) else jsonld_data
+        if isinstance(jsonld_data, list):
+            jsonld_data = combine_jsonld(jsonld_data)
         url = self.endpoint
         if context:
             from urllib.parse import quote
@@ -32,13 +112,49 @@ class JSONLDGraphDBStorage:
             encoded_context = quote(context, safe='')
             url += f"?context={encoded_context}"
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response, size = self._post(url, headers, jsonld_data)
             if response.status_code in (200, 204):
-                print(f"Successfully uploaded JSON-LD to GraphDB repo '{self.repo_id}'.")
+                Logger.info(f"Successfully uploaded JSON-LD ({size} bytes) to GraphDB repo '{self.repo_id}'.")
                 return True
             else:
-                print(f"Failed to upload JSON-LD: {response.status_code} {response.text}")
+                Logger.error(f"Failed to upload JSON-LD: {response.status_code} {response.text}")
                 return False
         except Exception as e:
-            print(f"Error uploading JSON-LD to GraphDB: {e}")
-            return False 
\ No newline at end of file
+            Logger.error(f"Error uploading JSON-LD to GraphDB: {e}")
+            return False
+
+    @api_retry(
+        RETRYABLE_UPLOAD_ERRORS,
+        max_attempts=UPLOAD_MAX_ATTEMPTS,
+        max_wait=UPLOAD_MAX_WAIT_SECONDS,
+        max_delay=UPLOAD_RETRY_SECONDS
+    )
+    def _post(self, url: str, headers: Dict[str, str], jsonld_data: Union[dict, list, str]) -> Tuple[httpx.Response, int]:
+        """
+        Send one upload request, retrying failures that are safe to retry
+        with backoff, for at most UPLOAD_RETRY_SECONDS.
+
+        The body is encoded again for every attempt, since a streamed body
+        can only be sent once.
+
+        Returns:
+            The response and the number of bytes sent
+        """
+        sizes = []
+        if isinstance(jsonld_data, str):
+            content = jsonld_data.encode("utf-8")
+            sizes.append(len(content))
+        elif isinstance(jsonld_data, dict) and len(jsonld_data.get("@graph") or ()) >= STREAM_MIN_NODES:
+            content = iter_encoded_chunks(jsonld_data, sizes)
+        else:
+            content = msgspec.json.encode(jsonld_data)
+            sizes.append(len(content))
+
+        response = self._client.post(url, headers=headers, content=content)
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            response.raise_for_status()
+        return response, sum(sizes)
+
+    def close(self) -> None:
+        """Close the HTTP connections."""
+        self._client.close()
@@ -1,20 +1,23 @@
 import json
-import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from src.utils.logger import Logger
 
+# Triples shown by display_results unless asked for more
+DEFAULT_MAX_ROWS = 1000
+
 
 class DisplayManager:
     """Manager for displaying pipeline results."""
     
     @staticmethod
-    def display_results(result: Dict, extraction_mode: str = "triples") -> None:
+    def display_results(result: Dict, extraction_mode: str = "triples", max_rows: Optional[int] = DEFAULT_MAX_ROWS) -> None:
         """
         Display the processing results in a readable format.
         
         Args:
             result: The result dictionary from pipeline processing
             extraction_mode: The extraction mode used ("triples" or "jsonld")
+            max_rows: Maximum number of triples to print, or None for all
         """
         if not result:
             Logger.warning("No results to display")
@@ -29,7 +32,7 @@ class DisplayManager:
             if extraction_mode == "jsonld":
                 DisplayManager._display_jsonld_results(result)
             else:
-                DisplayManager._display_triple_results(result)
+                DisplayManager._display_triple_results(result, max_rows)
             
             # Display failed chunks if any
             DisplayManager._display_failed_chunks(result)
@@ -62,16 +65,34 @@ class DisplayManager:
         print(json.dumps(jsonld_data, indent=2))
     
     @staticmethod
-    def _display_triple_results(result: Dict) -> None:
-        """Display triple results."""
+    def _display_triple_results(result: Dict, max_rows: Optional[int] = DEFAULT_MAX_ROWS) -> None:
+        """Display triple results, formatting at most max_rows of them."""
         print("\n--- Extracted Triples ---")
         triples = result.get('triples', [])
         if triples:
-            df = pd.DataFrame(triples)
-            print(df.to_string(index=False))
+            shown = triples if max_rows is None else triples[:max_rows]
+            print(DisplayManager._format_table(shown))
+            if len(shown) < len(triples):
+                print(f"... and {len(triples) - len(shown)} more triples")
         else:
             print("No triples extracted.")
     
+    @staticmethod
+    def _format_table(rows: List[Dict]) -> str:
+        """Format dictionaries as a plain text table, one column per key."""
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+        widths = [
+            max(len(column), *(len(row[i]) for row in cells))
+            for i, column in enumerate(columns)
+        ]
+        lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths)).rstrip()]
+        lines.extend(
+            "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+            for row in cells
+        )
+        return "\n".join(lines)
+    
     @staticmethod
     def _display_failed_chunks(result: Dict) -> None:
         """Display information about failed chunks."""
@@ -104,10 +125,12 @@ class DisplayManager:
             total: Total items
             message: Progress message
         """
+        # Redraw at most about 100 times over a run
+        if current != total and current % max(1, total // 100) != 0:
+            return
         percentage = (current / total) * 100 if total > 0 else 0
-        print(f"\r{message}: {current}/{total} ({percentage:.1f}%)", end="", flush=True)
-        if current == total:
-            print()  # New line when complete
+        end = "\n" if current == total else ""  # New line when complete
+        print(f"\r{message}: {current}/{total} ({percentage:.1f}%)", end=end, flush=True)
     
     @staticmethod
     def display_error(error: str, details: Optional[str] = None) -> None:
@@ -159,4 +182,8 @@ class DisplayManager:
             print(f"🗑️  Removed {stats.get('duplicates_removed', 0)} duplicates")
         
         if stats.get('failed_chunks', 0) > 0:
-            print(f"❌ {stats.get('failed_chunks', 0)} chunks failed") 
\ No newline at end of file
+            print(f"❌ {stats.get('failed_chunks', 0)} chunks failed")
+        
+        cache_stats = stats.get('result_cache')
+        if cache_stats:
+            print(f"♻️  Result cache: {cache_stats['hits']}/{cache_stats['lookups']} hits ({cache_stats['hit_rate']:.0%})") 
\ No newline at end of file
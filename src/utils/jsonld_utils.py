@@ -0,0 +1,41 @@
+from typing import Dict, List, Optional, Union
+
+
+def combine_jsonld(docs: List[Dict], context: Optional[Dict] = None) -> Union[Dict, List[Dict]]:
+    """
+    Combine JSON-LD documents into one document with a shared @graph.
+
+    Lets a batch be expanded, compacted or uploaded once instead of once
+    per document.
+
+    Args:
+        docs: JSON-LD documents, with or without an @graph
+        context: @context of the combined document. The documents' own
+            @context entries are then dropped, so they must have been
+            written against it. If None, the documents' common @context is
+            kept; when they differ, the documents are returned as they are,
+            which is still valid JSON-LD (a top-level array).
+
+    Returns:
+        The combined document, or the documents themselves
+    """
+    if context is None:
+        if not docs:
+            return []
+        context = docs[0].get("@context")
+        if any(doc.get("@context") != context for doc in docs[1:]):
+            return docs
+
+    graph = []
+    for doc in docs:
+        if "@graph" in doc:
+            graph.extend(doc["@graph"])
+        else:
+            # A compacted single-node document has no @graph
+            node = {key: value for key, value in doc.items() if key != "@context"}
+            if node:
+                graph.append(node)
+
+    if context is None:
+        return {"@graph": graph}
+    return {"@context": context, "@graph": graph}
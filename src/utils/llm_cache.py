@@ -0,0 +1,247 @@
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from src.utils.logger import Logger
+
+# Fresh responses held at most while waiting for the extractor to commit them
+MAX_PENDING = 1024
+
+
+class LLMCache:
+    """
+    Persistent cache of raw LLM responses.
+
+    Responses are keyed by a SHA-256 digest of everything that determines
+    the model output (model, sampling settings and prompts), so repeated
+    requests for the same chunk are answered locally instead of hitting the
+    API again. Values are stored zlib-compressed in a SQLite database.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".llm_cache.sqlite",
+        ttl: Optional[float] = None,
+        disable: bool = False
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Location of the SQLite database file
+            ttl: Optional time-to-live for entries, in seconds
+            disable: If True, the cache never stores or returns anything
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.disabled = disable
+        self._lock = threading.Lock()
+        self._connection = None
+        # Responses waiting for commit, by cache key; different prompts may
+        # share a response text (e.g. "[]"), so several keys can hold it
+        self._pending: OrderedDict = OrderedDict()
+
+        if not self.disabled:
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key BLOB PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL)"
+            )
+            self._connection.commit()
+
+    @staticmethod
+    def make_key(*components) -> bytes:
+        """
+        Build a cache key from the request components.
+
+        Args:
+            components: JSON-serializable values identifying the request
+
+        Returns:
+            SHA-256 digest of the serialized components
+        """
+        payload = json.dumps(components, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        if self.disabled:
+            return None
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        value, created = row
+        if self.ttl is not None and time.time() - created > self.ttl:
+            return None
+
+        return zlib.decompress(value).decode("utf-8")
+
+    def set(self, key: bytes, value: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from make_key
+            value: Raw LLM response text
+        """
+        if self.disabled:
+            return
+
+        compressed = zlib.compress(value.encode("utf-8"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)",
+                (key, compressed, time.time())
+            )
+            self._connection.commit()
+
+    def hold(self, key: bytes, value: str) -> None:
+        """
+        Keep a fresh response until it is known to be usable.
+
+        Only the most recent MAX_PENDING responses are held, so responses
+        that are never committed don't accumulate.
+
+        Args:
+            key: Cache key from make_key
+            value: Raw LLM response text
+        """
+        if self.disabled:
+            return
+
+        with self._lock:
+            self._pending[key] = value
+            self._pending.move_to_end(key)
+            if len(self._pending) > MAX_PENDING:
+                self._pending.popitem(last=False)
+
+    def commit(self, value: str) -> None:
+        """
+        Store a held response, once it parsed; other values are ignored.
+
+        Every key holding the same text is stored, since the text parses
+        the same way whichever prompt produced it.
+
+        Args:
+            value: Raw LLM response text, as returned by the client
+        """
+        if self.disabled:
+            return
+
+        with self._lock:
+            keys = [key for key, held in self._pending.items() if held == value]
+            for key in keys:
+                del self._pending[key]
+        for key in keys:
+            self.set(key, value)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        if self.disabled:
+            return
+
+        with self._lock:
+            self._connection.execute("DELETE FROM cache")
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self.disabled = True
+
+
+def commit_response(client, response) -> None:
+    """Store a response the extractor could use, if the client's cache holds it."""
+    cache = getattr(client, "llm_cache", None)
+    if cache is not None and isinstance(response, str):
+        cache.commit(response)
+
+
+def cached_call(method: Callable) -> Callable:
+    """
+    Decorate an LLM client method that returns the raw response for a prompt.
+
+    The decorated method must take the user prompt as its first argument and
+    return the raw response text. The client's ``llm_cache`` attribute (if
+    set) is consulted before the call. Non-empty results of a miss are only
+    held, and stored once the extractor commits them after parsing. Sampled
+    output (temperature above 0) is neither looked up nor stored. Both
+    regular and ``async`` methods are supported.
+    """
+    def _cache(client) -> Optional[LLMCache]:
+        cache = getattr(client, "llm_cache", None)
+        if cache is None or cache.disabled or (client.temperature or 0) > 0:
+            return None
+        return cache
+
+    def _key(client, user_prompt: str) -> bytes:
+        return LLMCache.make_key(
+            client.model_name,
+            client.temperature,
+            client.max_tokens,
+            client.system_prompt,
+            user_prompt
+        )
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(client, user_prompt, *args, **kwargs):
+            cache = _cache(client)
+            if cache is None:
+                return await method(client, user_prompt, *args, **kwargs)
+
+            key = _key(client, user_prompt)
+            cached = cache.get(key)
+            if cached is not None:
+                Logger.debug("LLM cache hit")
+                return cached
+
+            output = await method(client, user_prompt, *args, **kwargs)
+            if output:
+                cache.hold(key, output)
+            return output
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(client, user_prompt, *args, **kwargs):
+        cache = _cache(client)
+        if cache is None:
+            return method(client, user_prompt, *args, **kwargs)
+
+        key = _key(client, user_prompt)
+        cached = cache.get(key)
+        if cached is not None:
+            Logger.debug("LLM cache hit")
+            return cached
+
+        output = method(client, user_prompt, *args, **kwargs)
+        if output:
+            cache.hold(key, output)
+        return output
+
+    return wrapper
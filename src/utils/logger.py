@@ -3,42 +3,49 @@ import sys
 from typing import Optional
 from pathlib import Path
 
+# logging.getLogger already returns one shared instance per name
+_logger = logging.getLogger("kg_pipeline")
+
+if not _logger.handlers:
+    _logger.setLevel(logging.INFO)
+
+    # Create console handler; it passes on every record the logger lets
+    # through, so the logger's level alone decides what is shown
+    _console_handler = logging.StreamHandler(sys.stdout)
+
+    # Create formatter
+    _console_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+
+    # Records still propagate to handlers configured by the application; the
+    # console handler stays quiet then, so nothing is printed twice
+    _console_handler.addFilter(lambda record: not logging.getLogger().handlers)
+
+    # Add handler to logger
+    _logger.addHandler(_console_handler)
+
 
 class Logger:
-    """Centralized logging utility for the knowledge graph pipeline."""
-    
-    _instance = None
-    _logger = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(Logger, cls).__new__(cls)
-        return cls._instance
-    
-    def __init__(self):
-        if self._logger is None:
-            self._logger = logging.getLogger("kg_pipeline")
-            self._logger.setLevel(logging.INFO)
-            
-            # Create console handler
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(logging.INFO)
-            
-            # Create formatter
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            console_handler.setFormatter(formatter)
-            
-            # Add handler to logger
-            self._logger.addHandler(console_handler)
-    
+    """
+    Centralized logging utility for the knowledge graph pipeline.
+
+    The logging methods are the underlying logger's own bound methods, so a
+    log call costs no more than calling the logging module directly.
+    """
+
+    _logger = _logger
+
+    debug = staticmethod(_logger.debug)
+    info = staticmethod(_logger.info)
+    warning = staticmethod(_logger.warning)
+    error = staticmethod(_logger.error)
+    critical = staticmethod(_logger.critical)
+
     @classmethod
     def configure(cls, level: str = "INFO", log_file: Optional[Path] = None):
         """Configure the logger with specific settings."""
-        logger = cls()
-        
         # Set log level
         level_map = {
             "DEBUG": logging.DEBUG,
@@ -47,10 +54,10 @@ class Logger:
             "ERROR": logging.ERROR,
             "CRITICAL": logging.CRITICAL
         }
-        
+
         if level.upper() in level_map:
-            logger._logger.setLevel(level_map[level.upper()])
-        
+            cls._logger.setLevel(level_map[level.upper()])
+
         # Add file handler if log file is specified
         if log_file:
             file_handler = logging.FileHandler(log_file)
@@ -60,34 +67,14 @@ class Logger:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(formatter)
-            logger._logger.addHandler(file_handler)
-    
+            cls._logger.addHandler(file_handler)
+
     @classmethod
-    def get_logger(cls):
+    def get_logger(cls) -> logging.Logger:
         """Get the configured logger instance."""
-        return cls()._logger
-    
-    @classmethod
-    def debug(cls, message: str):
-        """Log debug message."""
-        cls.get_logger().debug(message)
-    
-    @classmethod
-    def info(cls, message: str):
-        """Log info message."""
-        cls.get_logger().info(message)
-    
-    @classmethod
-    def warning(cls, message: str):
-        """Log warning message."""
-        cls.get_logger().warning(message)
-    
-    @classmethod
-    def error(cls, message: str):
-        """Log error message."""
-        cls.get_logger().error(message)
-    
-    @classmethod
-    def critical(cls, message: str):
-        """Log critical message."""
-        cls.get_logger().critical(message) 
\ No newline at end of file
+        return cls._logger
+
+    @staticmethod
+    def is_debug_enabled() -> bool:
+        """Whether debug messages are emitted; check before building costly ones."""
+        return _logger.isEnabledFor(logging.DEBUG)
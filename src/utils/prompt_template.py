@@ -0,0 +1,40 @@
+from typing import Any
+
+# Stand-in for the chunk text while the rest of the template is formatted;
+# NUL characters can't occur in the prompt templates themselves
+_TEXT_MARKER = "\x00text_chunk\x00"
+
+
+class CompiledPrompt:
+    """
+    User prompt template with everything except the chunk text filled in.
+
+    The template is formatted once up front and split around the
+    ``{text_chunk}`` placeholder, so rendering a chunk's prompt is a plain
+    string join instead of a str.format call that re-parses the template.
+    """
+
+    def __init__(self, template: str, **fixed_vars: Any):
+        """
+        Compile a prompt template.
+
+        Args:
+            template: str.format-style template containing {text_chunk}
+            fixed_vars: Values for any other placeholders in the template
+        """
+        formatted = template.format(text_chunk=_TEXT_MARKER, **fixed_vars)
+        self._parts = formatted.split(_TEXT_MARKER)
+        if len(self._parts) < 2:
+            raise ValueError("Prompt template has no {text_chunk} placeholder")
+
+    def render(self, text_chunk: str) -> str:
+        """
+        Build the prompt for a chunk.
+
+        Args:
+            text_chunk: Text of the chunk
+
+        Returns:
+            The formatted prompt
+        """
+        return text_chunk.join(self._parts)
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import LFUCache
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for a cache."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookups": self.lookups,
+            "hit_rate": self.hit_rate
+        }
+
+
+class ChunkResultCache:
+    """
+    In-memory cache of extraction results for the lifetime of a pipeline.
+
+    Complements the persistent LLM response cache for interactive sessions
+    where the same chunks are processed repeatedly: hits skip the request,
+    the response parsing and the validation entirely. Entries are evicted
+    least-frequently-used first, so chunks that recur across runs stay
+    cached.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of chunk results kept
+        """
+        self._cache = LFUCache(maxsize=maxsize)
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up the extraction result for a chunk.
+
+        Args:
+            key: Chunk key from text_processor.chunk_key
+
+        Returns:
+            The cached extracted data, or None on a miss
+        """
+        data = self._cache.get(key)
+        if data is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return data
+
+    def set(self, key: Hashable, data: Any) -> None:
+        """
+        Store the extraction result for a chunk.
+
+        Args:
+            key: Chunk key from text_processor.chunk_key
+            data: Extracted data for the chunk
+        """
+        self._cache[key] = data
+
+    def clear(self) -> None:
+        """Remove all cached results and reset the counters."""
+        self._cache.clear()
+        self.stats = CacheStats()
@@ -0,0 +1,132 @@
+import msgspec
+import numpy as np
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from src.utils.logger import Logger
+
+
+class SemanticChunkCache:
+    """
+    Cache of extraction results keyed by chunk meaning rather than exact text.
+
+    Chunks are embedded with a small local sentence-transformers model and
+    stored in a FAISS inner-product index. A new chunk whose cosine
+    similarity to a cached chunk reaches the threshold reuses that chunk's
+    extraction result instead of calling the LLM.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        threshold: float = 0.95,
+        path: Optional[Union[str, Path]] = None,
+        signature: str = ""
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+            path: Optional directory to persist the index between runs
+            signature: Identifies the settings the cached results were
+                extracted with (mode, model, prompts, ontology). A persisted
+                index saved with a different signature is not loaded.
+        """
+        # Heavy dependencies, only needed when the semantic cache is enabled
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        self._faiss = faiss
+        self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.path = Path(path) if path else None
+        self.entries: List[Any] = []
+        # Results are only interchangeable for the same settings and
+        # embedding model
+        self.signature = f"{model_name}:{signature}"
+
+        dimension = self.model.get_sentence_embedding_dimension()
+        self.index = faiss.IndexFlatIP(dimension)
+
+        if self.path and (self.path / "index.faiss").exists():
+            self._load()
+
+    def _load(self) -> None:
+        """Load the persisted index, unless it was saved with other settings."""
+        meta_file = self.path / "meta.json"
+        saved_signature = None
+        if meta_file.exists():
+            with open(meta_file, "rb") as f:
+                saved_signature = msgspec.json.decode(f.read()).get("signature")
+        if saved_signature != self.signature:
+            Logger.warning(
+                f"Ignoring semantic chunk cache in {self.path}: it was built with "
+                "different extraction settings and will be replaced"
+            )
+            return
+
+        self.index = self._faiss.read_index(str(self.path / "index.faiss"))
+        with open(self.path / "entries.json", "rb") as f:
+            self.entries = msgspec.json.decode(f.read())
+        Logger.info(f"Loaded {len(self.entries)} entries into the semantic chunk cache")
+
+    def embed(self, texts: List[str]):
+        """
+        Embed chunk texts.
+
+        Args:
+            texts: Chunk texts
+
+        Returns:
+            Array of L2-normalized float32 embeddings, one row per text
+        """
+        return self.model.encode(
+            texts,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype("float32")
+
+    def lookup(self, embeddings) -> List[Optional[Any]]:
+        """
+        Find cached results for embedded chunks.
+
+        Args:
+            embeddings: Embeddings from embed()
+
+        Returns:
+            The cached result for each row, or None where there is no match
+        """
+        if self.index.ntotal == 0 or len(embeddings) == 0:
+            return [None] * len(embeddings)
+
+        scores, ids = self.index.search(np.asarray(embeddings, dtype=np.float32), 1)
+        return [
+            self.entries[row_ids[0]] if row_scores[0] >= self.threshold else None
+            for row_scores, row_ids in zip(scores, ids)
+        ]
+
+    def add(self, embeddings, results: List[Any]) -> None:
+        """
+        Add extraction results for embedded chunks.
+
+        Args:
+            embeddings: Embeddings from embed(), one row per result
+            results: Extraction results to cache
+        """
+        if not results:
+            return
+        self.index.add(np.asarray(embeddings, dtype=np.float32))
+        self.entries.extend(results)
+
+    def save(self) -> None:
+        """Persist the index and cached results, if a path was given."""
+        if not self.path:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._faiss.write_index(self.index, str(self.path / "index.faiss"))
+        with open(self.path / "entries.json", "wb") as f:
+            f.write(msgspec.json.encode(self.entries))
+        with open(self.path / "meta.json", "wb") as f:
+            f.write(msgspec.json.encode({"signature": self.signature}))
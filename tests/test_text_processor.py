@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("pymupdf4llm")
+
+from src.processors.text_processor import COLUMNAR_DEDUP_MIN_TRIPLES, TextProcessor
+
+
+def _triples(subjects, count):
+    """Build count triples over a few repeating subjects, so some are duplicates."""
+    return [
+        {
+            'subject': f" {subjects[i % len(subjects)]} ",
+            'predicate': "Was  Born In",
+            'object': f"City {i % 7}",
+            'chunk': i
+        }
+        for i in range(count)
+    ]
+
+
+def test_dedup_paths_agree_on_non_ascii_input():
+    processor = TextProcessor()
+    triples = _triples(["İstanbul", "Straße", "Ǆemal", "Marie Curie"], COLUMNAR_DEDUP_MIN_TRIPLES)
+
+    # A generator always takes the per-triple loop
+    expected = processor.deduplicate_triples(iter(triples))
+
+    assert processor.deduplicate_triples(triples) == expected
+    assert {t['subject'] for t in expected} >= {"İstanbul".lower(), "straße"}
+
+
+def test_columnar_dedup_matches_loop_on_ascii_input():
+    processor = TextProcessor()
+    triples = _triples(["Marie Curie", "PIERRE CURIE", "\x1cRadium\t"], COLUMNAR_DEDUP_MIN_TRIPLES)
+
+    expected = processor.deduplicate_triples(iter(triples))
+
+    assert processor._deduplicate_triples_columnar(triples) == expected
+    assert processor.deduplicate_triples(triples) == expected
+
+
+def test_columnar_dedup_keeps_triples_that_differ_only_around_nul():
+    processor = TextProcessor()
+    pair = [
+        {'subject': "a\x00b", 'predicate': "c", 'object': "d", 'chunk': 1},
+        {'subject': "a", 'predicate': "b\x00c", 'object': "d", 'chunk': 2}
+    ]
+    triples = pair * (COLUMNAR_DEDUP_MIN_TRIPLES // 2)
+
+    expected = processor.deduplicate_triples(iter(triples))
+
+    assert len(expected) == 2
+    assert processor._deduplicate_triples_columnar(triples) == expected
+    assert processor.deduplicate_triples(triples) == expected